@@ -4,19 +4,118 @@ Coordinator Agent (Functional Style)
 This module defines coordination and scoring tools and bundles them into an Agent.
 """
 
+import asyncio
+import functools
+import heapq
+import os
+import re
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional
+from textwrap import dedent
+from typing import Dict, Any, Coroutine, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union
 
 from agno.tools import tool
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
+from openai import AsyncOpenAI
 
+from agents.llm import get_async_openai, get_openai_chat
+from agents.resume_agent import safe_read_pdf
+from tools.score_numba import match_skills
+from tools.tool_utils import dumps, loads
 from config.settings import get_settings
 from logger.logger import log_info, log_debug, log_error, log_warn
 
 settings = get_settings()
 
+_T = TypeVar("_T")
+
+# Model used when a tool is called outside an agent run
+_DEFAULT_MODEL_ID = "gpt-4o"
+
+# Maximum number of concurrent LLM scoring requests in batch mode
+SCORING_CONCURRENCY = 16
+
+# Separators between skill names when required skills arrive as one string
+_SKILL_SEPARATOR_RE = re.compile(r"[,;\n]")
+
+SCORING_PROMPT = """
+You are an ATS scoring engine. Score the candidate resume against the job requirements.
+Respond with a JSON object containing numeric fields "skills_match", "experience_match",
+"education_match" and "overall_score", each between 0 and 10.
+"""
+
+
+def _copy_with_sendfile(source: Union[str, Path], destination: Union[str, Path]) -> None:
+    """Copy file contents in-kernel with sendfile, then copy timestamps."""
+    with open(source, 'rb') as src, open(destination, 'wb') as dst:
+        src_fd, dst_fd = src.fileno(), dst.fileno()
+        offset = 0
+        while True:
+            sent = os.sendfile(dst_fd, src_fd, offset, 1 << 20)
+            if sent == 0:
+                break
+            offset += sent
+    shutil.copystat(source, destination)
+
+
+def _link_or_copy(source: Union[str, Path], destination: Union[str, Path]) -> None:
+    """
+    Place a copy of source at destination using the cheapest available method.
+    
+    A hard link is tried first (metadata-only on the same filesystem), then an
+    in-kernel sendfile copy, and finally shutil.copy2 where neither is supported.
+    """
+    if os.path.exists(destination):
+        if os.path.samefile(source, destination):
+            return
+        os.unlink(destination)
+
+    try:
+        os.link(source, destination)
+        return
+    except OSError as e:
+        log_debug("Hard link failed for %s (%s), copying instead", os.path.basename(source), e)
+
+    if hasattr(os, "sendfile"):
+        try:
+            _copy_with_sendfile(source, destination)
+            return
+        except OSError as e:
+            log_debug("sendfile copy failed for %s (%s), using copy2", os.path.basename(source), e)
+
+    shutil.copy2(source, destination)
+
+
+def _scored_filename(score: float, filename: str) -> str:
+    """Prefix a resume filename with its score, e.g. 7_5__resume.pdf."""
+    if score >= 0:
+        # Round half up to one decimal with integer math
+        q = int(score * 10 + 0.5)
+        return f"{q // 10}_{q % 10}__{filename}"
+    score_str = f"{score:.1f}".replace('.', '_')
+    return f"{score_str}__{filename}"
+
+
+def _skill_names(required_skills: Any) -> List[str]:
+    """
+    Normalize required skills into a list of skill names.
+    
+    Args:
+        required_skills: Skills as a {skill: years} dict, a list of names, or a
+            comma/semicolon/newline separated string
+        
+    Returns:
+        Skill names (empty if none were given)
+    """
+    if not required_skills:
+        return []
+    if isinstance(required_skills, dict):
+        return [str(skill) for skill in required_skills]
+    if isinstance(required_skills, str):
+        return [skill.strip() for skill in _SKILL_SEPARATOR_RE.split(required_skills) if skill.strip()]
+    return [str(skill) for skill in required_skills]
+
 
 @tool(description="Score a resume against job requirements using LLM.")
 def score_resume(
@@ -38,11 +137,24 @@ def score_resume(
         Scoring results
     """
     try:
-        log_debug(f"Scoring resume with {len(resume_content)} chars against {len(job_requirements)} requirements")
+        log_debug("Scoring resume with %s chars against %s requirements", len(resume_content), len(job_requirements))
+
+        skills = _skill_names(job_requirements.get("required_skills"))
+        if not skills:
+            log_error("No required skills in job requirements")
+            return {"error": "No required skills in job requirements", "success": False}
+
+        # Count skill occurrences up front so the LLM starts from concrete matches
+        skill_hits = match_skills(resume_content, skills)
+        matched_skills = [skill for skill, hits in skill_hits.items() if hits]
+        missing_skills = [skill for skill, hits in skill_hits.items() if not hits]
 
         # Return a framework for the LLM to fill in
         return {
             "score_framework": {
+                "skill_hits": skill_hits,
+                "matched_skills": matched_skills,
+                "missing_skills": missing_skills,
                 "skills_match": "To be scored by LLM",
                 "experience_match": "To be scored by LLM",
                 "education_match": "To be scored by LLM",
@@ -76,24 +188,21 @@ def rename_and_move_resume(
         Result of the operation
     """
     try:
-        source = Path(source_path)
-        if not source.exists():
+        if not os.path.isfile(source_path):
             log_error(f"Source file not found: {source_path}")
             return {"error": f"File not found: {source_path}", "success": False}
 
-        dest_folder = Path(destination_folder)
-        dest_folder.mkdir(parents=True, exist_ok=True)
+        Path(destination_folder).mkdir(parents=True, exist_ok=True)
 
-        score_str = f"{score:.1f}".replace('.', '_')
-        new_filename = f"{score_str}__{source.name}"
-        destination = dest_folder / new_filename
+        source_name = os.path.basename(source_path)
+        destination = os.path.join(destination_folder, _scored_filename(score, source_name))
 
-        shutil.copy2(source, destination)
+        _link_or_copy(source_path, destination)
 
-        log_info(f"Moved resume from {source.name} to {destination}")
+        log_info(f"Moved resume from {source_name} to {destination}")
         return {
-            "original_path": str(source),
-            "new_path": str(destination),
+            "original_path": source_path,
+            "new_path": destination,
             "score": score,
             "success": True
         }
@@ -103,16 +212,195 @@ def rename_and_move_resume(
         return {"error": str(e), "success": False}
 
 
+@tool(description="Rename several resumes with their scores and move them to a destination folder.")
+def rename_and_move_resumes(
+    items: List[Tuple[str, float]],
+    destination_folder: str = "filtered_resumes"
+) -> Dict[str, Any]:
+    """
+    Rename and move multiple resumes based on their scores.
+    
+    The destination folder is created once for the whole batch and each
+    source is checked with a single stat call.
+    
+    Args:
+        items: List of (source_path, score) pairs
+        destination_folder: Destination folder
+        
+    Returns:
+        Result of the operation with per-file outcomes
+    """
+    try:
+        Path(destination_folder).mkdir(parents=True, exist_ok=True)
+        dest_folder = str(destination_folder)
+
+        moved = []
+        failed = []
+        for source_path, score in items:
+            try:
+                os.stat(source_path)
+            except OSError:
+                log_error(f"Source file not found: {source_path}")
+                failed.append({"original_path": source_path, "error": f"File not found: {source_path}"})
+                continue
+
+            try:
+                destination = os.path.join(dest_folder, _scored_filename(score, os.path.basename(source_path)))
+                _link_or_copy(source_path, destination)
+                moved.append({"original_path": source_path, "new_path": destination, "score": score})
+            except Exception as e:
+                log_error(f"Error moving resume {source_path}: {str(e)}")
+                failed.append({"original_path": source_path, "error": str(e)})
+
+        log_info(f"Moved {len(moved)} of {len(items)} resumes to {dest_folder}")
+        return {
+            "moved": moved,
+            "failed": failed,
+            "success": True
+        }
+
+    except Exception as e:
+        log_error(f"Error moving resumes: {str(e)}")
+        return {"error": str(e), "success": False}
+
+
+def _run_coroutine(coro: Coroutine[Any, Any, _T]) -> _T:
+    """
+    Run a coroutine to completion from synchronous tool code.
+    
+    When an event loop is already running in this thread (agno's async `arun`),
+    asyncio.run() would fail, so the coroutine runs on a worker thread with its own loop.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="score_batch") as ex:
+        return ex.submit(asyncio.run, coro).result()
+
+
+def _iter_pdfs(folder: str) -> Iterator[str]:
+    """Yield paths of PDF files in a folder while the directory is being read."""
+    with os.scandir(folder) as it:
+        for e in it:
+            if e.is_file(follow_symlinks=False) and e.name.lower().endswith('.pdf'):
+                yield e.path
+
+
+async def _score_one(
+    client: AsyncOpenAI,
+    model_id: str,
+    resume_path: str,
+    job_requirements: Dict[str, Any],
+    metadata_folder: Optional[str],
+    strict_mode: bool
+) -> Tuple[float, str]:
+    """Score a single resume with the LLM, returning (overall_score, path)."""
+    content = await asyncio.to_thread(safe_read_pdf, resume_path)
+
+    metadata = None
+    if metadata_folder:
+        stem = os.path.splitext(os.path.basename(resume_path))[0]
+        try:
+            with open(os.path.join(metadata_folder, f"{stem}.json"), 'rb') as f:
+                metadata = loads(f.read())
+        except FileNotFoundError:
+            pass
+
+    payload = {
+        "job_requirements": job_requirements,
+        "metadata": metadata,
+        "strict_mode": strict_mode,
+        "resume": content,
+    }
+    response = await client.chat.completions.create(
+        model=model_id,
+        temperature=0,
+        response_format={"type": "json_object"},
+        messages=[
+            {"role": "system", "content": SCORING_PROMPT},
+            {"role": "user", "content": dumps(payload)},
+        ],
+    )
+
+    result = loads(response.choices[0].message.content)
+    return float(result.get("overall_score", 0)), resume_path
+
+
+async def _score_resumes(
+    resume_paths: Iterable[str],
+    job_requirements: Dict[str, Any],
+    metadata_folder: Optional[str],
+    top_n: int,
+    strict_mode: bool,
+    api_key: Optional[str],
+    model_id: str
+) -> Tuple[int, List[Tuple[float, str]], List[Dict[str, Any]]]:
+    """
+    Score resumes concurrently and keep only the top_n results.
+    
+    Paths are consumed lazily: a producer feeds a bounded queue while
+    SCORING_CONCURRENCY workers score, so the first LLM request is sent
+    before the directory listing has finished.
+    
+    Returns:
+        (number of resumes seen, top candidates as (score, path) sorted best first, failures)
+    """
+    client = get_async_openai(api_key)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=SCORING_CONCURRENCY * 2)
+    heap: List[Tuple[float, str]] = []
+    failures: List[Dict[str, Any]] = []
+    total = 0
+
+    async def _produce() -> None:
+        nonlocal total
+        try:
+            for path in resume_paths:
+                total += 1
+                await queue.put(path)
+        finally:
+            for _ in range(SCORING_CONCURRENCY):
+                await queue.put(None)
+
+    async def _consume() -> None:
+        while True:
+            path = await queue.get()
+            if path is None:
+                return
+
+            try:
+                scored = await _score_one(client, model_id, path, job_requirements, metadata_folder, strict_mode)
+            except Exception as e:
+                log_error(f"Error scoring resume {path}: {str(e)}")
+                failures.append({"path": path, "error": str(e)})
+                continue
+
+            if len(heap) < top_n:
+                heapq.heappush(heap, scored)
+            else:
+                heapq.heappushpop(heap, scored)
+
+    try:
+        await asyncio.gather(_produce(), *(_consume() for _ in range(SCORING_CONCURRENCY)))
+    finally:
+        await client.close()
+
+    heap.sort(reverse=True)
+    return total, heap, failures
+
+
 @tool(description="Batch process resumes in a folder and prepare them for scoring and filtering.")
 def batch_process_resumes(
     resume_folder: str,
     job_requirements: Dict[str, Any],
     metadata_folder: Optional[str] = None,
     top_n: int = 5,
-    strict_mode: bool = False
+    strict_mode: bool = False,
+    agent: Optional[Agent] = None
 ) -> Dict[str, Any]:
     """
-    Process multiple resumes and prepare them for scoring.
+    Score multiple resumes concurrently and select the top candidates.
     
     Args:
         resume_folder: Folder containing resumes
@@ -120,6 +408,7 @@ def batch_process_resumes(
         metadata_folder: Optional folder with metadata
         top_n: Number of top candidates to select
         strict_mode: Whether to use strict matching
+        agent: Calling agent (injected by agno); its model and key are used for scoring
         
     Returns:
         Batch processing results
@@ -130,13 +419,28 @@ def batch_process_resumes(
             log_error(f"Resume folder not found: {resume_folder}")
             return {"error": f"Folder not found: {resume_folder}", "success": False}
 
-        resume_files = [f.name for f in folder.glob("*.pdf")]
-        log_info(f"Found {len(resume_files)} resumes in {resume_folder}")
+        # Score with the same model and key as the agent that called the tool
+        model = agent.model if agent is not None else None
+        model_id = getattr(model, "id", None) or _DEFAULT_MODEL_ID
+        api_key = getattr(model, "api_key", None)
+
+        total, top, failures = _run_coroutine(
+            _score_resumes(
+                _iter_pdfs(resume_folder), job_requirements, metadata_folder, top_n, strict_mode,
+                api_key, model_id
+            )
+        )
+        log_info(f"Found {total} resumes in {resume_folder}")
+        log_info(f"Scored {total - len(failures)} resumes, selected top {len(top)}")
 
         return {
-            "total_resumes": len(resume_files),
+            "total_resumes": total,
             "metadata_available": metadata_folder is not None,
-            "top_candidates": [],  # To be completed by LLM
+            "top_candidates": [
+                {"filename": os.path.basename(path), "path": path, "score": score}
+                for score, path in top
+            ],
+            "failed": failures,
             "success": True
         }
 
@@ -145,25 +449,35 @@ def batch_process_resumes(
         return {"error": str(e), "success": False}
 
 
-# 🧠 AGENT DEFINITION
-coordinator_agent = Agent(
-    name="Coordinator",
-    role="Coordinate resume evaluation, scoring, and selection.",
-    model=OpenAIChat(api_key=settings.OPENAI_API_KEY, id="gpt-4o"),
-    instructions="""
+_COORD_INSTRUCTIONS = dedent("""
     You are responsible for:
     - Scoring resumes based on job requirements and optional metadata
     - Ranking and selecting the top candidates
     - Moving resumes into a filtered folder with their score in the filename
 
     Use 'score_resume' to compute matches,
-    'rename_and_move_resume' to organize results,
+    'rename_and_move_resume' to organize results
+    ('rename_and_move_resumes' when moving several at once),
     and 'batch_process_resumes' to handle bulk operations.
-    """,
-    tools=[
-        score_resume,
-        rename_and_move_resume,
-        batch_process_resumes
-    ],
-    markdown=True
-)
\ No newline at end of file
+    """).strip()
+
+# 🧠 AGENT DEFINITION
+@functools.lru_cache(maxsize=4)
+def get_coordinator_agent(api_key: str, model_id: str = _DEFAULT_MODEL_ID) -> Agent:
+    """Get the coordinator agent for a model configuration (cached)."""
+    return Agent(
+        name="Coordinator",
+        role="Coordinate resume evaluation, scoring, and selection.",
+        model=get_openai_chat(api_key, model_id),
+        instructions=_COORD_INSTRUCTIONS,
+        tools=[
+            score_resume,
+            rename_and_move_resume,
+            rename_and_move_resumes,
+            batch_process_resumes
+        ],
+        markdown=True
+    )
+
+
+coordinator_agent = get_coordinator_agent(settings.OPENAI_API_KEY)
\ No newline at end of file
@@ -5,26 +5,39 @@ This module defines JD parsing tools and bundles them into an Agent.
 """
 
 import datetime
-import json
+import functools
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any
+from textwrap import dedent
+from typing import Dict, Any, List
 
 from agno.tools import tool
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
 
 from tools.jd_parser import (
-    extract_job_title,
-    extract_required_skills,
-    extract_responsibilities,
-    extract_qualifications
+    extract_job_title_obj,
+    extract_required_skills_obj,
+    extract_responsibilities_obj,
+    extract_qualifications_obj
 )
+from tools.tool_utils import dumps, loads
 
+from agents.llm import get_openai_chat
+from agents.mongo_writer import MONGO_ENABLED, enqueue
 from config.settings import get_settings
 from logger.logger import log_info, log_debug, log_error, log_warn
 
 settings = get_settings()
 
+# Parsed JD components by BLAKE2b digest of the content, least recently used first
+_PARSE_CACHE_SIZE = 512
+_parse_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
 
 @tool(description="Parse a job description file and extract structured information.")
 def parse_job_description(jd_path: str) -> Dict[str, Any]:
@@ -37,21 +50,74 @@ def parse_job_description(jd_path: str) -> Dict[str, Any]:
     Returns:
         Structured job description information
     """
-    try:
-        path = Path(jd_path)
-        if not path.exists():
-            log_error(f"Job description file not found: {jd_path}")
-            return json.dumps({"error": f"File not found: {jd_path}", "success": False})
+    return _parse_job_description(jd_path)
 
-        log_debug(f"Parsing job description: {path.name}")
-        with open(path, 'r', encoding='utf-8') as f:
-            jd_content = f.read()
 
-        # Call the parse_job_description_content function directly
-        return _parse_job_description_content(jd_content)
+@tool(description="Parse several job description files in parallel.")
+def parse_job_descriptions(jd_paths: List[str]) -> Dict[str, Any]:
+    """
+    Parse multiple job description files concurrently.
+    
+    Args:
+        jd_paths: Paths to the job description files
+        
+    Returns:
+        Structured information for each job description, in input order
+    """
+    try:
+        max_workers = min(32, (os.cpu_count() or 4) * 2)
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            results = list(ex.map(_parse_job_description_obj, jd_paths))
+
+        parsed = sum(1 for r in results if r.get("success"))
+        log_info(f"Parsed {parsed} of {len(jd_paths)} job descriptions", source="jd_agent")
+        return dumps({
+            "total_files": len(jd_paths),
+            "parsed_files": parsed,
+            "results": results,
+            "success": True
+        })
     except Exception as e:
+        log_error(f"Error batch parsing job descriptions: {str(e)}")
+        return dumps({"error": str(e), "success": False})
+
+
+def _parse_job_description(jd_path: str) -> Dict[str, Any]:
+    """
+    Internal implementation of job description file parsing.
+    
+    Args:
+        jd_path: Path to the job description file
+        
+    Returns:
+        Structured job description information as a JSON string
+    """
+    return dumps(_parse_job_description_obj(jd_path))
+
+
+def _parse_job_description_obj(jd_path: str) -> Dict[str, Any]:
+    """
+    Parse a job description file into a dict (no JSON encoding).
+    
+    Args:
+        jd_path: Path to the job description file
+        
+    Returns:
+        Structured job description information
+    """
+    if not os.path.isfile(jd_path):
+        log_error(f"Job description file not found: {jd_path}")
+        return {"error": f"File not found: {jd_path}", "success": False}
+
+    log_debug("Parsing job description: %s", os.path.basename(jd_path))
+    try:
+        jd_content = Path(jd_path).read_text(encoding='utf-8', errors='replace')
+    except OSError as e:
         log_error(f"Error parsing job description {jd_path}: {str(e)}")
-        return json.dumps({"error": str(e), "success": False})
+        return {"error": str(e), "success": False}
+
+    # Parse the content directly (handles its own errors)
+    return _parse_job_description_content_obj(jd_content)
 
 
 @tool(description="Parse job description content directly from string input.")
@@ -66,17 +132,63 @@ def parse_job_description_content(jd_content: str) -> Dict[str, Any]:
         Structured job description information
     """
     try:
-        log_debug(f"Parsing job description content")
+        log_debug("Parsing job description content")
         return _parse_job_description_content(jd_content)
     except Exception as e:
         log_error(f"Error parsing job description content: {str(e)}")
-        return json.dumps({"error": str(e), "success": False})
+        return dumps({"error": str(e), "success": False})
+
+
+def _parse_cached(jd_content: str) -> Dict[str, Any]:
+    """
+    Run the JD extractors and memoize the result by content digest.
+    
+    The cache is keyed on the digest alone, so it holds the extracted components
+    but not the job description text itself.
+    
+    Args:
+        jd_content: Job description text content
+        
+    Returns:
+        Extracted job components (shared cache entry, do not mutate)
+    """
+    content_hash = hashlib.blake2b(jd_content.encode('utf-8'), digest_size=16).digest()
+    with _parse_cache_lock:
+        parsed = _parse_cache.get(content_hash)
+        if parsed is not None:
+            _parse_cache.move_to_end(content_hash)
+            return parsed
+
+    parsed = {
+        "job_title": extract_job_title_obj(jd_content),
+        "required_skills": extract_required_skills_obj(jd_content),
+        "responsibilities": extract_responsibilities_obj(jd_content),
+        "qualifications": extract_qualifications_obj(jd_content),
+    }
+    with _parse_cache_lock:
+        _parse_cache[content_hash] = parsed
+        if len(_parse_cache) > _PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+    return parsed
 
 
 def _parse_job_description_content(jd_content: str) -> Dict[str, Any]:
     """
     Internal implementation of job description parsing.
     
+    Args:
+        jd_content: Job description text content
+        
+    Returns:
+        Structured job description information as a JSON string
+    """
+    return dumps(_parse_job_description_content_obj(jd_content))
+
+
+def _parse_job_description_content_obj(jd_content: str) -> Dict[str, Any]:
+    """
+    Parse job description content into a dict (no JSON encoding).
+    
     Args:
         jd_content: Job description text content
         
@@ -84,48 +196,27 @@ def _parse_job_description_content(jd_content: str) -> Dict[str, Any]:
         Structured job description information
     """
     try:
-        # Extract job components
-        job_title = extract_job_title(jd_content)
-        required_skills = extract_required_skills(jd_content)
-        responsibilities = extract_responsibilities(jd_content)
-        qualifications = extract_qualifications(jd_content)
-
-        # Convert string json to Python objects
-        job_title_obj = json.loads(job_title)
-        required_skills_obj = json.loads(required_skills)
-        responsibilities_obj = json.loads(responsibilities)
-        qualifications_obj = json.loads(qualifications)
-
-        # Store in MongoDB if configured
-        if getattr(settings, 'MONGO_URI', None):
-            try:
-                from pymongo import MongoClient
-                client = MongoClient(settings.MONGO_URI)
-                db = client.ats_agent
-                db.ats_job_descriptions.insert_one({
-                    "job_title": job_title_obj,
-                    "required_skills": required_skills_obj,
-                    "responsibilities": responsibilities_obj,
-                    "qualifications": qualifications_obj,
-                    "timestamp": datetime.datetime.now()
-                })
-            except Exception as e:
-                log_warn(f"Failed to store in MongoDB: {str(e)}")
-
-        log_info(f"Job description parsed: {job_title_obj}", source="jd_agent")
+        # Extract job components (served from cache for repeated content)
+        parsed = dict(_parse_cached(jd_content))
+
+        # Store in MongoDB if configured (buffered, off the critical path)
+        if MONGO_ENABLED:
+            enqueue("ats_job_descriptions", {
+                **parsed,
+                "timestamp": datetime.datetime.now()
+            })
+
+        log_info(f"Job description parsed: {parsed['job_title']}", source="jd_agent")
 
         # Return the structured result
-        return json.dumps({
-            "job_title": job_title_obj,
-            "required_skills": required_skills_obj,
-            "responsibilities": responsibilities_obj,
-            "qualifications": qualifications_obj,
+        return {
+            **parsed,
             "content": jd_content,
             "success": True
-        })
+        }
     except Exception as e:
         log_error(f"Error in _parse_job_description_content: {str(e)}")
-        return json.dumps({"error": str(e), "success": False})
+        return {"error": str(e), "success": False}
 
 
 @tool(description="Extract only the required skills from a parsed JD.")
@@ -141,49 +232,65 @@ def get_required_skills(parsed_jd: Dict[str, Any]) -> Dict[str, Any]:
     """
     try:
         if isinstance(parsed_jd, str):
-            parsed_jd = json.loads(parsed_jd)
+            parsed_jd = loads(parsed_jd)
 
         if not parsed_jd.get("success", False):
             log_error("Invalid job description data")
-            return json.dumps({"error": "Invalid job description data", "success": False})
+            return dumps({"error": "Invalid job description data", "success": False})
 
         required_skills = parsed_jd.get("required_skills", {})
         if isinstance(required_skills, str):
-            required_skills = json.loads(required_skills)
+            required_skills = loads(required_skills)
 
-        # Try to extract skills if they're not already available
-        if not required_skills and parsed_jd.get("content"):
-            required_skills = json.loads(extract_required_skills(parsed_jd["content"]))
+        # Common path: the parse step already extracted the skills
+        if required_skills:
+            log_info(f"Extracted {len(required_skills)} required skills", source="jd_agent")
+            return dumps({"skills": required_skills, "success": True})
+
+        # Otherwise extract them from the content
+        content = parsed_jd.get("content")
+        if content:
+            required_skills = extract_required_skills_obj(content)
 
         log_info(f"Extracted {len(required_skills)} required skills", source="jd_agent")
-        return json.dumps({"skills": required_skills, "success": True})
+        return dumps({"skills": required_skills, "success": True})
     except Exception as e:
         log_error(f"Error extracting required skills: {str(e)}")
-        return json.dumps({"error": str(e), "success": False})
+        return dumps({"error": str(e), "success": False})
 
 
-# 🧠 AGENT DEFINITION
-jd_parser_agent = Agent(
-    name="JDParser",
-    role="Extract structured job requirements from job descriptions.",
-    model=OpenAIChat(api_key=settings.OPENAI_API_KEY, id="gpt-4o"),
-    instructions="""
+_JD_INSTRUCTIONS = dedent("""
     Use the tools provided to extract job title, required skills, responsibilities, 
     and qualifications from a job description file or text content.
 
     You can either:
     - Use `parse_job_description_content()` if given the text directly.
     - Use `parse_job_description()` if given a file path.
+    - Use `parse_job_descriptions()` if given several file paths.
 
     You may also use `get_required_skills()` to isolate just the skills.
     
     Make sure to handle JSON responses appropriately - all functions return Python dictionaries,
     not JSON strings.
-    """,
-    tools=[
-        parse_job_description,
-        parse_job_description_content,
-        get_required_skills
-    ],
-    markdown=True
-)
\ No newline at end of file
+    """).strip()
+
+# 🧠 AGENT DEFINITION
+@functools.lru_cache(maxsize=4)
+def get_jd_parser_agent(api_key: str, model_id: str = "gpt-4o") -> Agent:
+    """Get the JD parser agent for a model configuration (cached)."""
+    return Agent(
+        name="JDParser",
+        role="Extract structured job requirements from job descriptions.",
+        model=get_openai_chat(api_key, model_id),
+        instructions=_JD_INSTRUCTIONS,
+        tools=[
+            parse_job_description,
+            parse_job_descriptions,
+            parse_job_description_content,
+            get_required_skills
+        ],
+        markdown=True
+    )
+
+
+jd_parser_agent = get_jd_parser_agent(settings.OPENAI_API_KEY)
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+Shared Resume Knowledge Base
+
+This module builds the resume PDF knowledge base once per process and loads
+only the PDFs that changed since the last run.
+"""
+
+import multiprocessing
+import threading
+from typing import Any, Dict, List, Optional
+
+from agno.knowledge.pdf import PDFKnowledgeBase
+from agno.vectordb.pgvector import PgVector, SearchType
+
+from config.settings import get_settings
+from knowledge_base.embedder import kb_table_name, load_incremental, make_embedder
+from logger.logger import log_info, log_error
+
+settings = get_settings()
+
+# Knowledge base, built on first use and loaded in the background
+# (never in batch extraction worker processes)
+_kb: Optional[PDFKnowledgeBase] = None
+_kb_initialized = False
+_kb_loader: Optional[threading.Thread] = None
+_kb_load_failed = False
+_kb_lock = threading.Lock()
+
+
+def _load_in_background(kb: PDFKnowledgeBase) -> None:
+    """Load the knowledge base off the caller's thread; record the failure if loading fails."""
+    global _kb_load_failed
+    try:
+        load_incremental(kb)
+        log_info("Knowledge base initialized successfully")
+    except Exception as e:
+        log_error(f"Failed to initialize knowledge base: {str(e)}")
+        # Agents already hold this instance, so keep it and flag it as unusable instead
+        _kb_load_failed = True
+
+
+def get_kb() -> Optional[PDFKnowledgeBase]:
+    """
+    Get the resume knowledge base, initializing it on first call.
+
+    The instance is returned immediately while its documents load on a background
+    thread; call wait_for_kb() before relying on the loaded contents.
+
+    Returns:
+        PDFKnowledgeBase instance, or None if unavailable
+    """
+    global _kb, _kb_initialized, _kb_loader
+    if _kb_initialized:
+        return _kb
+
+    with _kb_lock:
+        if _kb_initialized:
+            return _kb
+        if multiprocessing.parent_process() is None:
+            try:
+                _kb = PDFKnowledgeBase(
+                    path=str(settings.KB_DIR),
+                    vector_db=PgVector(
+                        table_name=kb_table_name(settings),
+                        db_url=settings.PG_CONNECTION_STRING,
+                        search_type=SearchType.hybrid,
+                        embedder=make_embedder(settings),
+                    ),
+                )
+                _kb_loader = threading.Thread(
+                    target=_load_in_background, args=(_kb,), name="kb_loader", daemon=True
+                )
+                _kb_loader.start()
+            except Exception as e:
+                log_error(f"Failed to initialize knowledge base: {str(e)}")
+                _kb = None
+        _kb_initialized = True
+    return _kb
+
+
+def wait_for_kb() -> Optional[PDFKnowledgeBase]:
+    """
+    Get the resume knowledge base once its background load has finished.
+
+    Returns:
+        Loaded PDFKnowledgeBase instance, or None if unavailable or loading failed
+    """
+    get_kb()
+    if _kb_loader is not None:
+        _kb_loader.join()
+    return None if _kb_load_failed else _kb
+
+
+def search_kb(query: str, num_documents: Optional[int] = None, **kwargs) -> Optional[List[Dict[str, Any]]]:
+    """
+    Retriever for agents holding the knowledge base: search it once loaded.
+
+    Waits for the background load, and returns no references if it failed rather
+    than searching a partially loaded table.
+
+    Args:
+        query: Search query
+        num_documents: Maximum number of documents to return
+
+    Returns:
+        Matching documents as dicts, or None if there are none
+    """
+    kb = wait_for_kb()
+    if kb is None:
+        return None
+    docs = kb.search(query=query, num_documents=num_documents, **kwargs)
+    return [doc.to_dict() for doc in docs] or None
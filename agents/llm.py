@@ -0,0 +1,60 @@
+"""
+Shared LLM Client Setup
+
+This module builds OpenAI chat models that share one pooled HTTP client.
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+import httpx
+from agno.models.openai import OpenAIChat
+from openai import AsyncOpenAI
+
+from config.settings import get_settings
+
+# Connection pool limits shared by the sync and async OpenAI clients
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+
+
+@lru_cache()
+def get_http_client() -> httpx.Client:
+    """Get the HTTP client shared by all OpenAI models (cached)."""
+    return httpx.Client(limits=_HTTP_LIMITS)
+
+
+def get_openai_chat(api_key: Optional[str] = None, model_id: str = "gpt-4o") -> OpenAIChat:
+    """
+    Create an OpenAI chat model backed by the shared connection pool.
+
+    Each agent gets its own model object (agno keeps per-agent tool state on it),
+    but all of them reuse the same keep-alive connections to the API.
+
+    Args:
+        api_key: OpenAI API key (defaults to the configured key)
+        model_id: OpenAI model id
+
+    Returns:
+        OpenAIChat model instance
+    """
+    if api_key is None:
+        api_key = get_settings().OPENAI_API_KEY
+    return OpenAIChat(api_key=api_key, id=model_id, http_client=get_http_client())
+
+
+def get_async_openai(api_key: Optional[str] = None) -> AsyncOpenAI:
+    """
+    Create an async OpenAI client with the same key and pool limits as the shared models.
+
+    Async connections belong to the event loop that opened them, so callers create
+    one client per loop (e.g. per batch) and close it when done.
+
+    Args:
+        api_key: OpenAI API key (defaults to the configured key)
+
+    Returns:
+        AsyncOpenAI client instance
+    """
+    if api_key is None:
+        api_key = get_settings().OPENAI_API_KEY
+    return AsyncOpenAI(api_key=api_key, http_client=httpx.AsyncClient(limits=_HTTP_LIMITS))
@@ -0,0 +1,110 @@
+"""
+Background MongoDB Writer
+
+This module owns the shared MongoDB client and batches document inserts off the
+request path: callers enqueue documents and a daemon thread writes them with
+insert_many every interval, or sooner when enough documents are waiting.
+"""
+
+import atexit
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import MongoClient
+
+from config.settings import get_settings
+from logger.logger import log_debug, log_warn
+
+settings = get_settings()
+
+MONGO_ENABLED = bool(getattr(settings, 'MONGO_URI', None))
+
+_FLUSH_INTERVAL = 0.2  # seconds
+_FLUSH_THRESHOLD = 100  # documents
+_STOP = object()
+
+_queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+_client: Optional[MongoClient] = None
+_writer: Optional[threading.Thread] = None
+_lock = threading.Lock()
+
+
+def get_db():
+    """Get the ats_agent database from the shared MongoDB client (created on first use)."""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = MongoClient(settings.MONGO_URI, maxPoolSize=50, serverSelectionTimeoutMS=2000)
+    return _client.ats_agent
+
+
+def _write(batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+    """Insert a batch of (collection, document) pairs, one insert_many per collection."""
+    by_collection: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for collection, document in batch:
+        by_collection[collection].append(document)
+
+    db = get_db()
+    for collection, documents in by_collection.items():
+        try:
+            db[collection].insert_many(documents, ordered=False)
+            log_debug("Stored %s documents in %s", len(documents), collection)
+        except Exception as e:
+            log_warn(f"Failed to store {len(documents)} documents in {collection}: {str(e)}")
+
+
+def _writer_loop() -> None:
+    """Collect queued documents into batches and write them until stopped."""
+    while True:
+        item = _queue.get()
+        if item is _STOP:
+            return
+
+        batch = [item]
+        deadline = time.monotonic() + _FLUSH_INTERVAL
+        stopping = False
+        while len(batch) < _FLUSH_THRESHOLD:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = _queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                stopping = True
+                break
+            batch.append(item)
+
+        _write(batch)
+        if stopping:
+            return
+
+
+def _shutdown() -> None:
+    """Write any queued documents before the interpreter exits."""
+    if _writer is not None:
+        _queue.put(_STOP)
+        _writer.join(timeout=10)
+
+
+def enqueue(collection: str, document: Dict[str, Any]) -> None:
+    """
+    Queue a document for insertion into MongoDB.
+
+    Args:
+        collection: Name of the collection in the ats_agent database
+        document: Document to insert
+    """
+    global _writer
+    if _writer is None:
+        with _lock:
+            if _writer is None:
+                _writer = threading.Thread(target=_writer_loop, name="mongo_writer", daemon=True)
+                _writer.start()
+                atexit.register(_shutdown)
+    _queue.put((collection, document))
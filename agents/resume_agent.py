@@ -4,77 +4,48 @@ Resume Parsing Agent (Functional Style) - Fixed Implementation
 This module defines resume parsing tools and bundles them into an Agent.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List
-import json
+from typing import Dict, Any, Union
 import datetime
+import functools
+import os
 
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
-from agno.knowledge.pdf import PDFKnowledgeBase
-from agno.vectordb.pgvector import PgVector, SearchType
-from agno.embedder.openai import OpenAIEmbedder
 from agno.tools import tool
 
+from agents.kb import get_kb, search_kb, wait_for_kb
+from agents.llm import get_openai_chat
+from agents.mongo_writer import MONGO_ENABLED, enqueue
+from tools.resume_parser import (
+    _FITZ_AVAILABLE,
+    _extract_one,
+    _list_metadata,
+    _read_metadata,
+    find_matching_metadata,
+    safe_read_pdf as read_pdf_text
+)
+from tools.tool_utils import dumps, process_map
 from config.settings import get_settings
 from logger.logger import log_info, log_debug, log_error, log_warn
 
 # Load settings
 settings = get_settings()
 
-# Initialize Knowledge Base globally
-try:
-    kb = PDFKnowledgeBase(
-        path=str(settings.KB_DIR),
-        vector_db=PgVector(
-            table_name="resume_kb",
-            db_url=settings.PG_CONNECTION_STRING,
-            search_type=SearchType.hybrid,
-            embedder=OpenAIEmbedder(
-                api_key=settings.OPENAI_API_KEY,
-                id="text-embedding-3-small"
-            ),
-        ),
-    )
-    kb.load(upsert=True)
-    log_info("Knowledge base initialized successfully")
-except Exception as e:
-    log_error(f"Failed to initialize knowledge base: {str(e)}")
-    kb = None
-
 
-def safe_read_pdf(path: Path) -> str:
+def safe_read_pdf(path: Union[str, Path]) -> str:
     """Safely read the content of a PDF file using fallback methods."""
     try:
-        # Try using PyMuPDF (fitz) if available
-        try:
-            import fitz
-            doc = fitz.open(str(path))
-            content = ""
-            for page in doc:
-                content += page.get_text()
-            return content
-        except ImportError:
+        # Without PyMuPDF, prefer the knowledge base's copy over raw decoding
+        if not _FITZ_AVAILABLE:
             log_warn("PyMuPDF not available, falling back to basic extraction")
-            
-        # Try using the knowledge base
-        if kb:
-            content = kb.get_document_content(str(path))
-            if content:
-                return content
-            
-        # Fallback to text reading with different encodings
-        for encoding in ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']:
-            try:
-                with open(path, 'r', encoding=encoding) as f:
-                    return f.read()
-            except UnicodeDecodeError:
-                continue
-                
-        # Last resort: binary read with replace for decoding errors
-        with open(path, 'rb') as f:
-            return f.read().decode('utf-8', errors='replace')
-            
+            kb = wait_for_kb()
+            if kb:
+                content = kb.get_document_content(str(path))
+                if content:
+                    return content
+
+        return read_pdf_text(path)
     except Exception as e:
         log_error(f"Error reading PDF {path}: {str(e)}")
         return f"[Error reading PDF: {str(e)}]"
@@ -82,103 +53,125 @@ def safe_read_pdf(path: Path) -> str:
 
 @tool(description="Parse a resume PDF file and extract its text content.")
 def parse_resume_pdf(pdf_path: str) -> str:
+    if not os.path.exists(pdf_path):
+        log_error(f"PDF file not found: {pdf_path}")
+        return dumps({"error": f"File not found: {pdf_path}", "success": False})
+
     try:
-        path = Path(pdf_path)
-        if not path.exists():
-            log_error(f"PDF file not found: {pdf_path}")
-            return json.dumps({"error": f"File not found: {pdf_path}", "success": False})
-
-        log_debug(f"Parsing resume: {path.name}")
-        content = safe_read_pdf(path)
-        log_debug(f"Extracted {len(content)} characters from {path.name}")
+        filename = os.path.basename(pdf_path)
+        log_debug("Parsing resume: %s", filename)
+        content = safe_read_pdf(pdf_path)
+        log_debug("Extracted %s characters from %s", len(content), filename)
         
-        return json.dumps({"filename": path.name, "content": content, "success": True})
-    except Exception as e:
+        return dumps({"filename": filename, "content": content, "success": True})
+    except OSError as e:
         log_error(f"Error parsing resume {pdf_path}: {str(e)}")
-        return json.dumps({"error": str(e), "success": False})
+        return dumps({"error": str(e), "success": False})
 
 
 @tool(description="Load metadata from a JSON file for a given resume.")
 def load_metadata(metadata_path: str) -> str:
     try:
-        path = Path(metadata_path)
-        if not path.exists():
+        try:
+            st = os.stat(metadata_path)
+        except FileNotFoundError:
             log_warn(f"Metadata file not found: {metadata_path}")
-            return json.dumps({"metadata": {}, "warning": f"File not found: {metadata_path}", "success": False})
-
-        log_debug(f"Loading metadata: {path.name}")
-        with open(path, 'r', encoding='utf-8') as f:
-            metadata = json.load(f)
-
-        if getattr(settings, 'MONGO_URI', None):
-            try:
-                from pymongo import MongoClient
-                client = MongoClient(settings.MONGO_URI)
-                db = client.ats_agent
-                db.ats_resumes.insert_one({
-                    "filename": path.stem,
-                    "metadata": metadata,
-                    "timestamp": datetime.datetime.now()
-                })
-                log_info(f"Metadata stored in MongoDB for {path.stem}", source="resume_agent")
-            except Exception as e:
-                log_warn(f"Failed to store metadata in MongoDB: {str(e)}")
+            return dumps({"metadata": {}, "warning": f"File not found: {metadata_path}", "success": False})
+
+        filename = os.path.basename(metadata_path)
+        stem = os.path.splitext(filename)[0]
+        log_debug("Loading metadata: %s", filename)
+        metadata = _read_metadata(metadata_path, st.st_mtime_ns, st.st_size)
+
+        if MONGO_ENABLED:
+            enqueue("ats_resumes", {
+                "filename": stem,
+                "metadata": metadata,
+                "timestamp": datetime.datetime.now()
+            })
+            log_debug("Metadata queued for MongoDB for %s", stem)
+
+        log_info(f"Metadata loaded for {stem}", source="resume_agent")
+        return dumps({"metadata": metadata, "success": True})
+    except Exception as e:
+        log_error(f"Error loading metadata {metadata_path}: {str(e)}")
+        return dumps({"error": str(e), "success": False})
+
 
-        log_info(f"Metadata loaded for {path.stem}", source="resume_agent")
-        return json.dumps({"metadata": metadata, "success": True})
+def _load_metadata_entry(metadata_path: str) -> Dict[str, Any]:
+    """Load one metadata file for batch loading (runs in a worker thread)."""
+    stem = os.path.basename(metadata_path)[:-5]
+    try:
+        st = os.stat(metadata_path)
+        return {
+            "filename": stem,
+            "metadata": _read_metadata(metadata_path, st.st_mtime_ns, st.st_size),
+            "success": True
+        }
     except Exception as e:
         log_error(f"Error loading metadata {metadata_path}: {str(e)}")
-        return json.dumps({"error": str(e), "success": False})
+        return {
+            "filename": stem,
+            "success": False,
+            "error": str(e)
+        }
 
 
-@tool(description="Find metadata file matching a given resume.")
-def find_matching_metadata(resume_name: str, metadata_folder: str) -> str:
+@tool(description="Load all metadata JSON files in a folder.")
+def batch_load_metadata(metadata_folder: str) -> str:
     try:
-        metadata_path = Path(metadata_folder) / f"{resume_name}.json"
-        if metadata_path.exists():
-            return json.dumps({"metadata_path": str(metadata_path), "success": True})
+        try:
+            names = _list_metadata(metadata_folder, os.stat(metadata_folder).st_mtime_ns)
+        except FileNotFoundError:
+            log_error(f"Metadata folder not found: {metadata_folder}")
+            return dumps({"error": f"Folder not found: {metadata_folder}", "success": False})
+
+        paths = [os.path.join(metadata_folder, f"{name}.json") for name in sorted(names)]
+
+        # Overlap the file reads on a thread pool; parsed files are served from cache
+        if len(paths) > 1:
+            max_workers = min(32, (os.cpu_count() or 4) * 2, len(paths))
+            with ThreadPoolExecutor(max_workers=max_workers) as ex:
+                results = list(ex.map(_load_metadata_entry, paths))
         else:
-            log_warn(f"No matching metadata found for {resume_name}")
-            return json.dumps({"warning": f"No metadata for {resume_name}", "success": False})
+            results = [_load_metadata_entry(path) for path in paths]
+
+        loaded = [r for r in results if r["success"]]
+        if MONGO_ENABLED:
+            timestamp = datetime.datetime.now()
+            for r in loaded:
+                enqueue("ats_resumes", {
+                    "filename": r["filename"],
+                    "metadata": r["metadata"],
+                    "timestamp": timestamp
+                })
+
+        log_info(f"Loaded metadata for {len(loaded)} of {len(paths)} resumes", source="resume_agent")
+        return dumps({
+            "total_files": len(paths),
+            "loaded_files": len(loaded),
+            "results": results,
+            "success": True
+        })
     except Exception as e:
-        log_error(f"Error finding metadata for {resume_name}: {str(e)}")
-        return json.dumps({"error": str(e), "success": False})
+        log_error(f"Error batch loading metadata: {str(e)}")
+        return dumps({"error": str(e), "success": False})
 
 
 @tool(description="Process all resume files in a folder.")
 def batch_process_resume_folder(folder_path: str) -> str:
     try:
-        folder = Path(folder_path)
-        if not folder.exists():
+        if not os.path.exists(folder_path):
             log_error(f"Resume folder not found: {folder_path}")
-            return json.dumps({"error": f"Folder not found: {folder_path}", "success": False})
+            return dumps({"error": f"Folder not found: {folder_path}", "success": False})
 
-        pdf_files = list(folder.glob("*.pdf"))
+        with os.scandir(folder_path) as entries:
+            pdf_files = [e.path for e in entries if e.is_file(follow_symlinks=False) and e.name.endswith(".pdf")]
         log_info(f"Found {len(pdf_files)} PDF files in {folder_path}")
 
-        results = []
-        for pdf_file in pdf_files:
-            try:
-                # Directly extract content without calling parse_resume_pdf tool
-                path = str(pdf_file)
-                content = safe_read_pdf(pdf_file)
-                
-                results.append({
-                    "filename": pdf_file.name,
-                    "path": path,
-                    "content": content,
-                    "success": True
-                })
-            except Exception as e:
-                log_error(f"Error processing {pdf_file.name}: {str(e)}")
-                results.append({
-                    "filename": pdf_file.name,
-                    "path": str(pdf_file),
-                    "success": False,
-                    "error": str(e)
-                })
+        results = process_map(_extract_one, pdf_files)
 
-        return json.dumps({
+        return dumps({
             "total_files": len(pdf_files),
             "processed_files": len(results),
             "results": results,
@@ -186,27 +179,39 @@ def batch_process_resume_folder(folder_path: str) -> str:
         })
     except Exception as e:
         log_error(f"Error batch processing resumes: {str(e)}")
-        return json.dumps({"error": str(e), "success": False})
+        return dumps({"error": str(e), "success": False})
 
 
 # 🧠 AGENT DEFINITION
-resume_parser_agent = Agent(
-    name="ResumeParser",
-    role="Parse resumes and extract structured candidate data.",
-    model=OpenAIChat(api_key=settings.OPENAI_API_KEY, id="gpt-4o"),
-    instructions="""
-    Use the tools to process resume PDFs, load and validate metadata, and handle batch operations.
-    If metadata is not found, proceed with resume content only.
-    Always validate file paths before parsing.
-    """,
-    tools=[
-        parse_resume_pdf,
-        load_metadata,
-        find_matching_metadata,
-        batch_process_resume_folder
-    ],
-    knowledge=kb,
-    add_references=True,
-    search_knowledge=True,
-    markdown=True
-)
\ No newline at end of file
+@functools.lru_cache(maxsize=4)
+def get_resume_parser_agent(api_key: str, model_id: str = "gpt-4o") -> Agent:
+    """Get the resume parser agent for a model configuration (cached)."""
+    return Agent(
+        name="ResumeParser",
+        role="Parse resumes and extract structured candidate data.",
+        model=get_openai_chat(api_key, model_id),
+        instructions="""
+        Use the tools to process resume PDFs, load and validate metadata, and handle batch operations.
+        If metadata is not found, proceed with resume content only.
+        Always validate file paths before parsing.
+        """,
+        tools=[
+            parse_resume_pdf,
+            load_metadata,
+            find_matching_metadata,
+            batch_load_metadata,
+            batch_process_resume_folder
+        ],
+        knowledge=get_kb(),
+        retriever=search_kb,
+        add_references=True,
+        search_knowledge=True,
+        markdown=True
+    )
+
+
+def __getattr__(name: str) -> Any:
+    """Build `resume_parser_agent` (and the knowledge base) on first access, not at import."""
+    if name == "resume_parser_agent":
+        return get_resume_parser_agent(settings.OPENAI_API_KEY)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,14 @@
 from pathlib import Path
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
-import os
 from functools import lru_cache
+from typing import Set
+
+# Directories already created in this process, so repeated validation skips the mkdir
+_CREATED_DIRS: Set[Path] = set()
+
+# Working directory at import, used to resolve relative directory settings
+_CWD = Path.cwd()
 
 class Settings(BaseSettings):
     """Configuration settings for the ATS Filtering System."""
@@ -25,32 +31,42 @@ class Settings(BaseSettings):
         description="Directory for knowledge base documents"
     )
     
+    # Local cache settings
+    CACHE_DIR: Path = Field(
+        default=Path(".cache"),
+        description="Directory for local caches (e.g. extracted PDF text)"
+    )
+    
     # Model settings
     OPENAI_API_KEY: str = Field(
         default="",
         description="OpenAI API key"
     )
     
+    # Embedding settings
+    LOCAL_EMBEDDINGS: bool = Field(
+        default=False,
+        description="Embed knowledge base documents with a local fastembed model instead of OpenAI"
+    )
+    
     # PgVector settings
     PG_CONNECTION_STRING: str = Field(
         default="",
         description="PostgreSQL connection string for vector database"
     )
     
-    @field_validator("OUTPUT_DIR", "KB_DIR", mode="after")
+    @field_validator("OUTPUT_DIR", "KB_DIR", "CACHE_DIR", mode="after")
     @classmethod
     def validate_directories(cls, v: Path) -> Path:
         """Validate and resolve directory paths."""
-        # Convert Windows backslash paths correctly
-        if isinstance(v, str):
-            v = Path(v.replace('\\', '/'))
-        
-        # Ensure path is absolute
+        # Ensure path is absolute (v is already a Path in an "after" validator)
         if not v.is_absolute():
-            v = Path.cwd() / v
+            v = _CWD / v
             
-        # Create directory if it doesn't exist
-        os.makedirs(v, exist_ok=True)
+        # Create directory if it doesn't exist (once per process)
+        if v not in _CREATED_DIRS:
+            v.mkdir(parents=True, exist_ok=True)
+            _CREATED_DIRS.add(v)
             
         return v
     
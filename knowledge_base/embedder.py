@@ -0,0 +1,431 @@
+"""
+Batched Knowledge Base Embedding
+
+This module provides embedders that embed many chunks per call (OpenAI in batched
+API requests, or a local fastembed ONNX model), and loaders that feed knowledge
+base documents through them in large batches, skipping unchanged files.
+"""
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from agno.document import Document
+from agno.embedder.base import Embedder
+from agno.embedder.openai import OpenAIEmbedder
+from agno.knowledge.agent import AgentKnowledge
+from config.settings import Settings
+from logger.logger import log_info, log_debug, log_warn
+
+try:
+    from fastembed import TextEmbedding
+    _FASTEMBED_AVAILABLE = True
+except ImportError:
+    _FASTEMBED_AVAILABLE = False
+
+
+@dataclass
+class BatchingEmbedder(OpenAIEmbedder):
+    """OpenAI embedder that can prefetch embeddings for many texts at once."""
+
+    batch_size: int = 512  # inputs per request (the API allows up to 2048)
+    max_workers: int = 8  # concurrent batch requests
+    _prefetched: Dict[str, Tuple[List[float], Optional[Dict]]] = field(default_factory=dict, repr=False)
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed one batch of texts with a single API request."""
+        response = self.response(text=texts)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed many texts, batch_size inputs per request, and remember the results.
+
+        Duplicate texts are sent once. Later get_embedding/get_embedding_and_usage
+        calls for these texts are served from memory until clear() is called.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embeddings in the same order as texts
+        """
+        unique = [text for text in dict.fromkeys(texts) if text not in self._prefetched]
+        batches = [unique[i:i + self.batch_size] for i in range(0, len(unique), self.batch_size)]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as ex:
+            embeddings = [e for batch in ex.map(self._embed_batch, batches) for e in batch]
+
+        for text, embedding in zip(unique, embeddings):
+            self._prefetched[text] = (embedding, None)
+        return [self._prefetched[text][0] for text in texts]
+
+    def clear(self) -> None:
+        """Drop any prefetched embeddings that were not consumed."""
+        self._prefetched.clear()
+
+    def get_embedding(self, text: str) -> List[float]:
+        prefetched = self._prefetched.get(text)
+        if prefetched is not None:
+            return prefetched[0]
+        return super().get_embedding(text)
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        prefetched = self._prefetched.get(text)
+        if prefetched is not None:
+            return prefetched
+        return super().get_embedding_and_usage(text)
+
+
+@dataclass
+class LocalEmbedder(Embedder):
+    """Embedder backed by a local fastembed ONNX model (no network round trips)."""
+
+    id: str = "BAAI/bge-small-en-v1.5"
+    dimensions: int = 384
+    batch_size: int = 256
+    _model: Optional["TextEmbedding"] = field(default=None, repr=False)
+    _prefetched: Dict[str, Tuple[List[float], Optional[Dict]]] = field(default_factory=dict, repr=False)
+
+    @property
+    def model(self) -> "TextEmbedding":
+        if self._model is None:
+            if not _FASTEMBED_AVAILABLE:
+                raise ImportError("`fastembed` not installed. Please install it via `pip install fastembed`.")
+            self._model = TextEmbedding(self.id)
+        return self._model
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed many texts in one local model pass and remember the results.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embeddings in the same order as texts
+        """
+        unique = [text for text in dict.fromkeys(texts) if text not in self._prefetched]
+        for text, embedding in zip(unique, self.model.embed(unique, batch_size=self.batch_size)):
+            self._prefetched[text] = (embedding.tolist(), None)
+        return [self._prefetched[text][0] for text in texts]
+
+    def clear(self) -> None:
+        """Drop any prefetched embeddings that were not consumed."""
+        self._prefetched.clear()
+
+    def get_embedding(self, text: str) -> List[float]:
+        prefetched = self._prefetched.get(text)
+        if prefetched is not None:
+            return prefetched[0]
+        return next(iter(self.model.embed([text]))).tolist()
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        return self.get_embedding(text), None
+
+
+# Embedders that support embed_documents()/clear() prefetching
+_BATCH_EMBEDDERS = (BatchingEmbedder, LocalEmbedder)
+
+
+def make_embedder(settings: Settings) -> Embedder:
+    """
+    Create the knowledge base embedder selected by settings.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        LocalEmbedder when LOCAL_EMBEDDINGS is set, otherwise a BatchingEmbedder
+    """
+    if settings.LOCAL_EMBEDDINGS:
+        return LocalEmbedder()
+    return BatchingEmbedder(api_key=settings.OPENAI_API_KEY, id="text-embedding-3-small")
+
+
+def kb_table_name(settings: Settings, base: str = "resume_kb") -> str:
+    """Vector table for the configured embedder (local embeddings have a different dimension)."""
+    return f"{base}_bge_small" if settings.LOCAL_EMBEDDINGS else base
+
+
+def load_batched(kb: AgentKnowledge, upsert: bool = True, batch_size: int = 512,
+                 document_lists: Optional[Iterable[List[Document]]] = None) -> int:
+    """
+    Load a knowledge base like kb.load(), embedding documents in large batches.
+
+    Documents from several files are pooled until batch_size is reached, embedded
+    together when the vector db uses a batching embedder, then written to the vector db.
+    Afterwards the vector db's search indexes are created if missing.
+
+    Args:
+        kb: Knowledge base to load
+        upsert: Upsert documents if the vector db supports it (insert otherwise)
+        batch_size: Documents to embed and write per round
+        document_lists: Documents to load, per file (defaults to kb.document_lists)
+
+    Returns:
+        Number of documents loaded
+    """
+    vector_db = kb.vector_db
+    if not vector_db.exists():
+        vector_db.create()
+
+    embedder = getattr(vector_db, "embedder", None)
+    use_upsert = upsert and vector_db.upsert_available()
+    loaded = 0
+
+    def _flush(documents: List[Document]) -> None:
+        if isinstance(embedder, _BATCH_EMBEDDERS):
+            embedder.embed_documents([document.content for document in documents])
+        try:
+            if use_upsert:
+                vector_db.upsert(documents=documents)
+            else:
+                vector_db.insert(documents=documents)
+        finally:
+            if isinstance(embedder, _BATCH_EMBEDDERS):
+                embedder.clear()
+        log_debug("Loaded batch of %s documents", len(documents))
+
+    pending: List[Document] = []
+    if document_lists is None:
+        document_lists = kb.document_lists
+    for documents in document_lists:
+        pending.extend(documents)
+        if len(pending) >= batch_size:
+            _flush(pending)
+            loaded += len(pending)
+            pending = []
+    if pending:
+        _flush(pending)
+        loaded += len(pending)
+
+    log_info(f"Added {loaded} documents to knowledge base")
+
+    # Build the ANN (HNSW) index if it does not exist yet, so searches stop scanning every row
+    if hasattr(vector_db, "optimize"):
+        vector_db.optimize()
+    return loaded
+
+
+# Per-file signatures of the last successful KB load into a vector table, kept next to the PDFs
+_KB_MANIFEST = ".kb_manifest.{table}.json"
+
+
+def file_sha1(path: str) -> str:
+    """Hash a file's contents in 1 MiB chunks (the hash recorded in the manifest)."""
+    digest = hashlib.sha1(usedforsecurity=False)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _pdf_doc_name(file_name: str) -> str:
+    """Document name agno's PDFReader gives the rows of a PDF file."""
+    return file_name.split(".")[0]
+
+
+def _manifest_path(kb: AgentKnowledge) -> str:
+    """Manifest file of the knowledge base's vector table."""
+    table = getattr(kb.vector_db, "table_name", "default")
+    return os.path.join(str(kb.path), _KB_MANIFEST.format(table=table))
+
+
+def _read_manifest(kb: AgentKnowledge) -> Dict[str, List[Any]]:
+    """
+    Read the manifest of files loaded into the knowledge base's vector table.
+
+    The manifest is ignored when the table does not exist: a fresh database or a
+    dropped table has none of the recorded rows.
+
+    Args:
+        kb: Knowledge base whose manifest to read
+
+    Returns:
+        [mtime_ns, size, sha1] of every loaded PDF, keyed by path relative to kb.path
+    """
+    try:
+        with open(_manifest_path(kb), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest and not kb.vector_db.exists():
+        log_info(f"Vector table {getattr(kb.vector_db, 'table_name', 'default')} does not exist, reloading all PDFs")
+        return {}
+    return manifest
+
+
+def _write_manifest(kb: AgentKnowledge, manifest: Dict[str, List[Any]]) -> None:
+    """Replace the manifest of the knowledge base's vector table."""
+    with open(_manifest_path(kb), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+
+
+def _file_signature(path: str) -> List[Any]:
+    """Manifest entry of a file: [mtime_ns, size, sha1]."""
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size, file_sha1(path)]
+
+
+def _scan_pdfs(kb_dir: str) -> Dict[str, str]:
+    """
+    Find the PDFs agno's PDFKnowledgeBase loads from a directory (its "**/*.pdf" glob).
+
+    Args:
+        kb_dir: Knowledge base directory
+
+    Returns:
+        Path of every PDF file, keyed by its "/"-separated path relative to kb_dir
+    """
+    pdfs: Dict[str, str] = {}
+    for root, _, files in os.walk(kb_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            if name.endswith(".pdf") and os.path.isfile(path):
+                pdfs[os.path.relpath(path, kb_dir).replace(os.sep, "/")] = path
+    return pdfs
+
+
+def _delete_documents(vector_db: Any, names: List[str]) -> int:
+    """
+    Delete every row (all chunks) of the named documents from a vector table.
+
+    Args:
+        vector_db: PgVector-style vector database with a SQLAlchemy table and Session
+        names: Document names to delete
+
+    Returns:
+        Number of rows deleted
+    """
+    table = getattr(vector_db, "table", None)
+    session_factory = getattr(vector_db, "Session", None)
+    if not names or table is None or session_factory is None:
+        return 0
+    if hasattr(vector_db, "table_exists") and not vector_db.table_exists():
+        return 0
+
+    from sqlalchemy import delete
+
+    with session_factory() as sess:
+        result = sess.execute(delete(table).where(table.c.name.in_(names)))
+        sess.commit()
+    return result.rowcount
+
+
+def load_incremental(kb: AgentKnowledge) -> None:
+    """
+    Load only new or changed PDFs into the knowledge base.
+
+    PDFs are found recursively, as PDFKnowledgeBase does, and tracked by their path
+    relative to the knowledge base directory. Files whose (mtime_ns, size) match the
+    manifest are skipped outright; a changed stat with an unchanged SHA-1 is also
+    treated as unchanged. Rows of changed and removed files are deleted before
+    loading, so no stale chunks remain. Each vector table has its own manifest;
+    delete it to force a full reload.
+
+    Args:
+        kb: Knowledge base to load into
+    """
+    kb_dir = str(kb.path)
+    previous = _read_manifest(kb)
+
+    current: Dict[str, List[Any]] = {}
+    unchanged: Set[str] = set()
+    for rel, path in _scan_pdfs(kb_dir).items():
+        st = os.stat(path)
+        known = previous.get(rel)
+        if known and known[0] == st.st_mtime_ns and known[1] == st.st_size:
+            current[rel] = known
+            unchanged.add(rel)
+            continue
+        sha1 = file_sha1(path)
+        current[rel] = [st.st_mtime_ns, st.st_size, sha1]
+        if known and known[2] == sha1:
+            unchanged.add(rel)
+
+    # agno's exclude_files matches file names, not paths, so PDFs in different
+    # subdirectories sharing a name are always loaded or skipped together
+    basename = os.path.basename
+    for name, count in Counter(basename(rel) for rel in current).items():
+        if count > 1:
+            log_warn(f"{count} PDFs in {kb_dir} are named {name}; they are reloaded together whenever one changes")
+
+    # Drop the old rows of changed or removed files, and forget them in the manifest
+    # so a failed load below cannot leave them recorded as loaded. Rows are keyed by
+    # document name, so an unchanged file sharing that name is reloaded too.
+    stale_docs = {_pdf_doc_name(basename(rel)) for rel in previous if rel not in unchanged}
+    if stale_docs:
+        deleted = _delete_documents(kb.vector_db, sorted(stale_docs))
+        log_info(f"Removed {deleted} stale rows for {len(stale_docs)} changed or deleted PDFs")
+        _write_manifest(kb, {rel: sig for rel, sig in previous.items()
+                             if _pdf_doc_name(basename(rel)) not in stale_docs})
+
+    to_load = {basename(rel) for rel in current if rel not in unchanged}
+    unchanged = {rel for rel in unchanged
+                 if _pdf_doc_name(basename(rel)) not in stale_docs and basename(rel) not in to_load}
+
+    if len(unchanged) < len(current) or not previous:
+        log_info(f"Loading {len(current) - len(unchanged)} new or changed PDFs into the knowledge base")
+        kb.exclude_files = sorted({basename(rel) for rel in unchanged})
+        load_batched(kb, upsert=True)
+    else:
+        log_debug("Knowledge base is up to date, skipping load")
+
+    _write_manifest(kb, current)
+
+
+def loaded_hashes(kb: AgentKnowledge) -> Set[str]:
+    """
+    SHA-1s of the PDFs recorded as loaded into the knowledge base's vector table.
+
+    Args:
+        kb: Knowledge base to check
+
+    Returns:
+        file_sha1() of every file in the manifest
+    """
+    return {sig[2] for sig in _read_manifest(kb).values()}
+
+
+def load_files(kb: AgentKnowledge, paths: List[str]) -> int:
+    """
+    Load specific PDFs from the knowledge base directory and record them in the manifest.
+
+    Existing rows under the files' document names are replaced, and other recorded
+    files sharing those names are reloaded with them, so load_incremental() sees
+    every file as unchanged afterwards.
+
+    Args:
+        kb: Knowledge base to load into
+        paths: PDFs inside kb.path
+
+    Returns:
+        Number of documents loaded
+    """
+    kb_dir = str(kb.path)
+    manifest = _read_manifest(kb)
+    files = {os.path.relpath(path, kb_dir).replace(os.sep, "/"): path for path in paths}
+    doc_names = {_pdf_doc_name(os.path.basename(rel)) for rel in files}
+    for rel in manifest:
+        path = os.path.join(kb_dir, rel)
+        if rel not in files and _pdf_doc_name(os.path.basename(rel)) in doc_names and os.path.isfile(path):
+            files[rel] = path
+
+    # As in load_incremental, forget the files before touching their rows
+    for rel in files:
+        manifest.pop(rel, None)
+    _write_manifest(kb, manifest)
+    _delete_documents(kb.vector_db, sorted(doc_names))
+
+    loaded = load_batched(kb, upsert=True,
+                          document_lists=(kb.reader.read(pdf=Path(path)) for path in files.values()))
+
+    for rel, path in files.items():
+        manifest[rel] = _file_signature(path)
+    _write_manifest(kb, manifest)
+    return loaded
@@ -1,10 +1,13 @@
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Optional, List
 from agno.knowledge.pdf import PDFKnowledgeBase
 from agno.vectordb.pgvector import PgVector, SearchType
-from agno.embedder.openai import OpenAIEmbedder
 from logger.logger import log_info, log_debug, log_error
 from config.settings import Settings
+from knowledge_base.embedder import file_sha1, kb_table_name, load_files, load_incremental, loaded_hashes, make_embedder
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import os
 import shutil
 
 class KnowledgeBaseLoader:
@@ -22,16 +25,41 @@ class KnowledgeBaseLoader:
         self.pg_connection = settings.PG_CONNECTION_STRING
         self.openai_api_key = settings.OPENAI_API_KEY
 
-        # Ensure the knowledge base directory exists
-        if not Path(self.kb_path).exists():
-            log_info(f"Knowledge base directory does not exist. Creating: {self.kb_path}")
-            Path(self.kb_path).mkdir(parents=True, exist_ok=True)  # Automatically create directory if not exists
+        # The knowledge base directory is created by Settings validation
+
+    def _build_knowledge_base(self, table_name: str = "resume_kb",
+                              search_type: SearchType = SearchType.hybrid) -> PDFKnowledgeBase:
+        """
+        Create the PDF knowledge base without loading any documents.
+
+        Args:
+            table_name: Name of the PostgreSQL table for vector storage
+            search_type: Search type for vector database
+
+        Returns:
+            PDFKnowledgeBase instance
+        """
+        # Set up vector database
+        vector_db = PgVector(
+            table_name=kb_table_name(self.settings, table_name),
+            db_url=self.pg_connection,
+            search_type=search_type,
+            embedder=make_embedder(self.settings),
+        )
+
+        # Create knowledge base with 'path' parameter instead of 'location'
+        return PDFKnowledgeBase(
+            path=str(self.kb_path),  # Changed from 'location' to 'path'
+            vector_db=vector_db,
+        )
 
     def load_knowledge_base(self, table_name: str = "resume_kb", 
                             search_type: SearchType = SearchType.hybrid) -> Optional[PDFKnowledgeBase]:
         """
         Load the PDF knowledge base.
 
+        Unchanged PDFs are not re-embedded; the existing vector table is reused.
+
         Args:
             table_name: Name of the PostgreSQL table for vector storage
             search_type: Search type for vector database
@@ -41,26 +69,10 @@ class KnowledgeBaseLoader:
         """
         try:
             log_info("Initializing PDF Knowledge Base")
+            kb = self._build_knowledge_base(table_name, search_type)
 
-            # Set up vector database
-            vector_db = PgVector(
-                table_name=table_name,
-                db_url=self.pg_connection,
-                search_type=search_type,
-                embedder=OpenAIEmbedder(
-                    api_key=self.openai_api_key,
-                    id="text-embedding-3-small"
-                ),
-            )
-
-            # Create and load knowledge base with 'path' parameter instead of 'location'
-            kb = PDFKnowledgeBase(
-                path=str(self.kb_path),  # Changed from 'location' to 'path'
-                vector_db=vector_db,
-            )
-
-            # Load documents and create embeddings
-            kb.load(upsert=True)
+            # Embed only PDFs that are new or changed since the last load (batched API requests)
+            load_incremental(kb)
 
             log_info(f"Knowledge base loaded with documents from {self.kb_path}")
             return kb
@@ -69,42 +81,101 @@ class KnowledgeBaseLoader:
             log_error(f"Failed to load knowledge base: {str(e)}")
             return None
 
+    @staticmethod
+    def _valid_pdf_paths(docs_paths: List[str]) -> List[Path]:
+        """
+        Filter document paths down to existing PDF files.
+
+        Each parent directory is listed once with os.scandir instead of
+        stat()-ing every path.
+
+        Args:
+            docs_paths: List of paths to documents
+
+        Returns:
+            Paths of the existing PDF files, in input order
+        """
+        paths = [Path(doc_path) for doc_path in docs_paths]
+        names_by_parent: Dict[Path, set] = defaultdict(set)
+        for path in paths:
+            names_by_parent[path.parent].add(path.name)
+
+        entries: Dict[Path, Dict[str, os.DirEntry]] = {}
+        for parent, names in names_by_parent.items():
+            try:
+                with os.scandir(parent) as it:
+                    entries[parent] = {entry.name: entry for entry in it if entry.name in names and entry.is_file()}
+            except OSError:
+                entries[parent] = {}
+
+        valid = []
+        for doc_path, path in zip(docs_paths, paths):
+            if path.name not in entries[path.parent]:
+                log_error(f"Document path does not exist: {doc_path}")
+            elif path.suffix.lower() != '.pdf':
+                log_error(f"Invalid file format, expected PDF: {doc_path}")
+            else:
+                valid.append(path)
+        return valid
+
+    def _copy_document(self, path: Path) -> Optional[Path]:
+        """
+        Copy a document into the knowledge base directory.
+
+        Args:
+            path: Path of the document to copy
+
+        Returns:
+            Destination path, or None if the copy failed
+        """
+        dest_path = Path(self.kb_path) / path.name
+        try:
+            shutil.copy2(path, dest_path)
+            log_debug("Added document to knowledge base: %s", path.name)
+            return dest_path
+        except Exception as e:
+            log_error(f"Failed to copy document {path.name}: {str(e)}")
+            return None
+
     def add_documents(self, docs_paths: List[str]) -> bool:
         """
         Add documents to the knowledge base.
 
+        Only new PDFs are embedded: files whose SHA-1 is already in the knowledge
+        base manifest are skipped, and added files are recorded there so the next
+        load_knowledge_base() does not embed them again.
+
         Args:
             docs_paths: List of paths to documents to add
 
         Returns:
             Success status
         """
-        kb = self.load_knowledge_base()
-        if not kb:
-            return False
-
         try:
-            for doc_path in docs_paths:
-                path = Path(doc_path)
-                if path.exists():
-                    if path.suffix.lower() == '.pdf':
-                        # Copy document to knowledge base directory
-                        dest_path = Path(self.kb_path) / path.name
-                        try:
-                            shutil.copy2(path, dest_path)
-                            log_debug(f"Added document to knowledge base: {path.name}")
-                        except Exception as e:
-                            log_error(f"Failed to copy document {path.name}: {str(e)}")
-                    else:
-                        log_error(f"Invalid file format, expected PDF: {doc_path}")
-                else:
-                    log_error(f"Document path does not exist: {doc_path}")
-
-            # Reload knowledge base to update embeddings
-            kb.load(upsert=True)
-            log_info(f"Knowledge base updated with new documents")
+            kb = self._build_knowledge_base()
+
+            # Hash the candidates and keep only PDFs not embedded yet
+            known = loaded_hashes(kb)
+            new_docs = []
+            for path in self._valid_pdf_paths(docs_paths):
+                digest = file_sha1(str(path))
+                if digest in known:
+                    log_debug("Document already in knowledge base, skipping: %s", path.name)
+                    continue
+                known.add(digest)
+                new_docs.append(path)
+
+            # Copy documents to the knowledge base directory concurrently (I/O bound)
+            with ThreadPoolExecutor(max_workers=16) as ex:
+                copied = [str(dest_path) for dest_path in ex.map(self._copy_document, new_docs) if dest_path is not None]
+
+            # Embed the copied documents in batches and record them in the manifest
+            if copied:
+                load_files(kb, copied)
+
+            log_info(f"Knowledge base updated with {len(copied)} new documents")
             return True
 
         except Exception as e:
             log_error(f"Failed to add documents to knowledge base: {str(e)}")
-            return False
\ No newline at end of file
+            return False
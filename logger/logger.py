@@ -5,19 +5,68 @@ This module provides a custom logger that extends the built-in logging.Logger
 to log messages to both MongoDB and a styled console output using Rich.
 """
 
+import atexit
+import functools
 import logging
 import datetime
-from typing import Any, Dict, Optional
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
 from rich.logging import RichHandler
 from rich.console import Console
 from rich.text import Text
-from pymongo import MongoClient
+from pymongo import InsertOne, MongoClient
 from pymongo.collection import Collection
 from pymongo.errors import PyMongoError
 
 # Create Rich console for styled output
 console = Console()
 
+# Log documents are queued and written in bulk by a background worker
+_QUEUE_SIZE = 10000  # entries; beyond this, new entries are dropped
+_BATCH_SIZE = 500  # entries
+_BATCH_WINDOW = 0.5  # seconds
+_STOP = object()
+
+# Level names used in MongoDB entries, mapped to logging levels
+_LEVEL_MAP = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "EXCEPTION": logging.ERROR,
+}
+
+# Centered banner decorations
+_EQ20 = '=' * 20
+_DASH10 = '- ' * 10
+_BANG10 = '! ' * 10
+_X10 = 'X ' * 10
+
+# Level -> (style, left decoration, right decoration)
+_BANNER_PARTS = {
+    "INFO": ("bold blue", _EQ20, _EQ20),
+    "DEBUG": ("cyan", _DASH10, _DASH10[::-1]),
+    "WARNING": ("yellow", _BANG10, _BANG10[::-1]),
+    "ERROR": ("bold red", _X10, _X10[::-1]),
+}
+
+@functools.lru_cache(maxsize=256)
+def _banner(level: str, msg: str) -> str:
+    """Build the Rich markup for a centered banner message."""
+    style, left, right = _BANNER_PARTS[level]
+    return f"[{style}]{left} {msg} {right}[/{style}]"
+
+@functools.lru_cache(maxsize=8)
+def _get_mongo_client(uri: str) -> MongoClient:
+    """Get the MongoDB client for a URI, shared by every logger in the process.
+
+    Writes are unacknowledged (w=0, no journal) since logs are best-effort.
+    """
+    return MongoClient(uri, maxPoolSize=50, minPoolSize=5, w=0, journal=False,
+                       serverSelectionTimeoutMS=2000)
+
 class AgnoLogger(logging.Logger):
     """Custom logger that logs to both MongoDB and console with Rich styling."""
     
@@ -36,70 +85,130 @@ class AgnoLogger(logging.Logger):
         )
         self.addHandler(rich_handler)
         
-        # Set up MongoDB connection if URI provided
+        # Set up MongoDB connection if URI provided, reusing the shared client's pool
         self.mongo_collection = None
         if db_uri:
             try:
-                client = MongoClient(db_uri)
+                client = _get_mongo_client(db_uri)
                 db = client.ats_agent
                 self.mongo_collection = db[collection_name]
             except PyMongoError as e:
                 console.print(f"[bold red]Failed to connect to MongoDB: {str(e)}[/bold red]")
+        
+        # Queue log entries for a background worker that writes them in bulk
+        self._q: "queue.Queue[Any]" = queue.Queue(maxsize=_QUEUE_SIZE)
+        self._worker: Optional[threading.Thread] = None
+        self._mongo_enabled = self.mongo_collection is not None
+        if self._mongo_enabled:
+            self._worker = threading.Thread(target=self._consume, name=f"{name}_mongo_writer", daemon=True)
+            self._worker.start()
+            atexit.register(self._shutdown)
+    
+    def setLevel(self, level) -> None:
+        """Set the logging level and reset this logger's isEnabledFor cache."""
+        super().setLevel(level)
+        # Not registered with logging's manager, so its cache is not cleared for us
+        self._cache.clear()
     
-    def _log_to_mongo(self, level: str, msg: str, source: str = "system", 
+    def _write(self, entries: List[Dict[str, Any]]) -> None:
+        """Write a batch of log entries to MongoDB in one bulk request, stamped with one timestamp."""
+        timestamp = datetime.datetime.now(datetime.timezone.utc)
+        for entry in entries:
+            entry["timestamp"] = timestamp
+            entry["message"] = self._format(*entry["message"])
+        try:
+            self.mongo_collection.bulk_write([InsertOne(entry) for entry in entries], ordered=False)
+        except PyMongoError as e:
+            console.print(f"[bold red]Failed to log to MongoDB: {str(e)}[/bold red]")
+    
+    @staticmethod
+    def _format(msg: str, args: tuple) -> str:
+        """Format a deferred log message like logging.LogRecord.getMessage."""
+        if not args:
+            return msg
+        try:
+            return msg % args
+        except (TypeError, ValueError):
+            return f"{msg} {args!r}"
+    
+    def _consume(self) -> None:
+        """Collect queued entries into batches of up to _BATCH_SIZE and write them."""
+        while True:
+            entry = self._q.get()
+            if entry is _STOP:
+                return
+            
+            entries = [entry]
+            deadline = time.monotonic() + _BATCH_WINDOW
+            while len(entries) < _BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = self._q.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    self._write(entries)
+                    return
+                entries.append(entry)
+            self._write(entries)
+    
+    def _shutdown(self) -> None:
+        """Let the worker write everything still queued before the interpreter exits."""
+        if self._worker is not None and self._worker.is_alive():
+            self._q.put(_STOP)
+            self._worker.join(timeout=10)
+    
+    def _log_to_mongo(self, level: str, msg: str, source: str = "system", args: tuple = (),
                       **extra: Dict[str, Any]) -> None:
-        """Log a message to MongoDB collection."""
-        if self.mongo_collection is None:
+        """Queue a log message for the MongoDB collection (never blocks the caller).
+
+        msg % args is formatted by the background writer, not here.
+        """
+        if not self._mongo_enabled or not self.isEnabledFor(_LEVEL_MAP[level]):
             return
             
+        log_entry = {
+            "level": level,
+            "message": (msg, args),
+            "source": source,
+            **extra
+        }
         try:
-            log_entry = {
-                "timestamp": datetime.datetime.now(),
-                "level": level,
-                "message": msg,
-                "source": source,
-                **extra
-            }
-            self.mongo_collection.insert_one(log_entry)
-        except PyMongoError as e:
-            console.print(f"[bold red]Failed to log to MongoDB: {str(e)}[/bold red]")
+            self._q.put_nowait(log_entry)
+        except queue.Full:
+            pass  # MongoDB is falling behind; drop rather than stall the caller
+    
+    def _emit(self, level: str, msg: str, args: tuple, source: str, center: bool,
+              kwargs: Dict[str, Any]) -> None:
+        """Log a message through the Rich handler (as a banner if centered) and to MongoDB.
+
+        As with logging, msg % args is only formatted by sinks that emit the message.
+        """
+        super().log(_LEVEL_MAP[level], _banner(level, msg) if center else msg, *args, **kwargs)
+        self._log_to_mongo(level, msg, source, args=args, **kwargs)
     
-    def info(self, msg: str, source: str = "system", center: bool = False, **kwargs):
+    def info(self, msg: str, *args, source: str = "system", center: bool = False, **kwargs):
         """Log an info message to both console and MongoDB."""
-        if center:
-            console.print(f"[bold blue]{'=' * 20} {msg} {'=' * 20}[/bold blue]")
-        else:
-            super().info(msg, **kwargs)
-        self._log_to_mongo("INFO", msg, source, **kwargs)
+        self._emit("INFO", msg, args, source, center, kwargs)
     
-    def debug(self, msg: str, source: str = "system", center: bool = False, **kwargs):
+    def debug(self, msg: str, *args, source: str = "system", center: bool = False, **kwargs):
         """Log a debug message to both console and MongoDB."""
-        if center:
-            console.print(f"[cyan]{'- ' * 10} {msg} {' -' * 10}[/cyan]")
-        else:
-            super().debug(msg, **kwargs)
-        self._log_to_mongo("DEBUG", msg, source, **kwargs)
+        self._emit("DEBUG", msg, args, source, center, kwargs)
     
-    def warn(self, msg: str, source: str = "system", center: bool = False, **kwargs):
+    def warn(self, msg: str, *args, source: str = "system", center: bool = False, **kwargs):
         """Log a warning message to both console and MongoDB."""
-        if center:
-            console.print(f"[yellow]{'! ' * 10} {msg} {' !' * 10}[/yellow]")
-        else:
-            super().warning(msg, **kwargs)
-        self._log_to_mongo("WARNING", msg, source, **kwargs)
+        self._emit("WARNING", msg, args, source, center, kwargs)
     
-    def error(self, msg: str, source: str = "system", center: bool = False, **kwargs):
+    def error(self, msg: str, *args, source: str = "system", center: bool = False, **kwargs):
         """Log an error message to both console and MongoDB."""
-        if center:
-            console.print(f"[bold red]{'X ' * 10} {msg} {' X' * 10}[/bold red]")
-        else:
-            super().error(msg, **kwargs)
-        self._log_to_mongo("ERROR", msg, source, **kwargs)
+        self._emit("ERROR", msg, args, source, center, kwargs)
     
-    def exception(self, msg: str, source: str = "system", **kwargs):
+    def exception(self, msg: str, *args, source: str = "system", **kwargs):
         """Log an exception message to both console and MongoDB."""
-        super().exception(msg, **kwargs)
-        self._log_to_mongo("EXCEPTION", msg, source, exc_info=True, **kwargs)
+        super().exception(msg, *args, **kwargs)
+        self._log_to_mongo("EXCEPTION", msg, source, args=args, exc_info=True, **kwargs)
 
 
 # Create a global instance of our logger
@@ -108,17 +217,17 @@ settings = get_settings()
 logger = AgnoLogger("ats_system", db_uri=settings.MONGO_URI, collection_name="ats_logs")
 
 # Convenience functions for common log levels
-def log_info(msg: str, source: str = "system", center: bool = False, **kwargs):
-    logger.info(msg, source=source, center=center, **kwargs)
+def log_info(msg: str, *args, source: str = "system", center: bool = False, **kwargs):
+    logger.info(msg, *args, source=source, center=center, **kwargs)
 
-def log_debug(msg: str, source: str = "system", center: bool = False, **kwargs):
-    logger.debug(msg, source=source, center=center, **kwargs)
+def log_debug(msg: str, *args, source: str = "system", center: bool = False, **kwargs):
+    logger.debug(msg, *args, source=source, center=center, **kwargs)
 
-def log_warn(msg: str, source: str = "system", center: bool = False, **kwargs):
-    logger.warn(msg, source=source, center=center, **kwargs)
+def log_warn(msg: str, *args, source: str = "system", center: bool = False, **kwargs):
+    logger.warn(msg, *args, source=source, center=center, **kwargs)
 
-def log_error(msg: str, source: str = "system", center: bool = False, **kwargs):
-    logger.error(msg, source=source, center=center, **kwargs)
+def log_error(msg: str, *args, source: str = "system", center: bool = False, **kwargs):
+    logger.error(msg, *args, source=source, center=center, **kwargs)
 
-def log_exception(msg: str, source: str = "system", **kwargs):
-    logger.exception(msg, source=source, **kwargs)
\ No newline at end of file
+def log_exception(msg: str, *args, source: str = "system", **kwargs):
+    logger.exception(msg, *args, source=source, **kwargs)
\ No newline at end of file
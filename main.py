@@ -6,14 +6,10 @@ ranking candidates, and logging results to both MongoDB and the console.
 """
 import os
 import argparse
-from dotenv import load_dotenv
+import functools
 from pathlib import Path
 
-from agno.team.team import Team
-from agents.resume_agent import resume_parser_agent
-from agents.jd_agent import jd_parser_agent
-from agents.coordinator import coordinator_agent
-from logger.logger import logger, log_info, log_debug, log_error
+from logger.logger import logger, log_info, log_error
 from config.settings import get_settings
 
 def parse_args():
@@ -25,27 +21,20 @@ def parse_args():
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
     return parser.parse_args()
 
-def main():
-    # Load environment variables
-    load_dotenv()
-    # Parse command-line arguments
-    args = parse_args()
-
-    # Load settings
-    settings = get_settings()
-    
-    # Configure logging based on debug flag
-    if args.debug:
-        logger.setLevel("DEBUG")
+@functools.lru_cache(maxsize=4)
+def _build_team(api_key: str, debug: bool):
+    """Build the ATS team (cached, so repeated main() calls reuse it and its agents)."""
+    # Agent modules are imported on first use, once the inputs have been validated
+    from agno.team.team import Team
+    from agents.resume_agent import get_resume_parser_agent
+    from agents.jd_agent import jd_parser_agent
+    from agents.coordinator import coordinator_agent
 
-    log_info("Starting ATS Resume Filtering System", center=True)
-    
-    # Create the team
-    ats_team = Team(
+    return Team(
         name="ATS_Team",
         mode="coordinate",
         success_criteria="Successfully match and rank candidates based on job description requirements",
-        members=[resume_parser_agent, jd_parser_agent, coordinator_agent],
+        members=[get_resume_parser_agent(api_key), jd_parser_agent, coordinator_agent],
         instructions=[
             "Process the job description using the JDParser's parse_job_description_content tool",
             "Process resumes from the folder path provided using the ResumeParser's batch_process_resume_folder tool",
@@ -56,33 +45,50 @@ def main():
         enable_agentic_context=True,
         share_member_interactions=True,
         show_tool_calls=True,
-        debug_mode=args.debug,
+        debug_mode=debug,
         markdown=True,
         show_members_responses=True,
     )
 
+def main():
+    # Parse command-line arguments
+    args = parse_args()
+
+    # Load environment variables
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    # Load settings
+    settings = get_settings()
+    
+    # Configure logging based on debug flag
+    if args.debug:
+        logger.setLevel("DEBUG")
+
+    log_info("Starting ATS Resume Filtering System", center=True)
+    
     # Process job description
     job_description_path = Path(args.jd)
-    if not job_description_path.exists():
+
+    # Read the file once; decode as UTF-8 and only detect the encoding if that fails
+    try:
+        raw = job_description_path.read_bytes()
+    except FileNotFoundError:
         logger.error(f"Job description file not found: {args.jd}")
         return
 
-    # Try different encodings to read the file
-    encodings_to_try = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-    jd_content = None
-    for encoding in encodings_to_try:
-        try:
-            with open(job_description_path, 'r', encoding=encoding) as f:
-                jd_content = f.read()
-            log_info(f"Successfully read job description file using {encoding} encoding")
-            break
-        except UnicodeDecodeError:
-            log_debug(f"Failed to read with {encoding} encoding, trying next...")
-
-    if jd_content is None:
-        logger.error("Failed to read job description file with any encoding, using binary mode")
-        with open(job_description_path, 'rb') as f:
-            jd_content = f.read().decode('utf-8', errors='replace')
+    try:
+        jd_content = raw.decode('utf-8')
+        log_info("Successfully read job description file using utf-8 encoding")
+    except UnicodeDecodeError:
+        from charset_normalizer import from_bytes
+        best = from_bytes(raw).best()
+        if best is not None:
+            jd_content = str(best)
+            log_info(f"Successfully read job description file using {best.encoding} encoding")
+        else:
+            logger.error("Could not detect the job description encoding, decoding as UTF-8 with replacement")
+            jd_content = raw.decode('utf-8', errors='replace')
 
     # Process resumes and metadata
     resume_folder = Path(args.folder)
@@ -90,6 +96,13 @@ def main():
         logger.error(f"Resume folder not found: {args.folder}")
         return
 
+    # Get the team and reset it and its cached member agents to empty memory
+    # (team context and each agent's run history would otherwise carry over between runs)
+    ats_team = _build_team(settings.OPENAI_API_KEY, args.debug)
+    ats_team.memory = None
+    for member in ats_team.members:
+        member.memory = None
+
     # Build the message for the ATS team
     message = f"""
     I need to process job applications for the following job description:
@@ -4,9 +4,9 @@ File Manager Tool
 This module provides utility functions for file operations.
 """
 
+import errno
 import os
 import shutil
-from pathlib import Path
 from typing import Dict, Any, List
 
 from agno.tools import tool
@@ -25,13 +25,12 @@ def list_resume_files(folder_path: str, extension: str = "pdf") -> List[str]:
         List of file paths
     """
     try:
-        folder = Path(folder_path)
-        if not folder.exists():
-            log_error(f"Folder not found: {folder_path}")
-            return []
-            
-        files = list(folder.glob(f"*.{extension}"))
-        return [str(file) for file in files]
+        suffix = f".{extension}"
+        with os.scandir(folder_path) as entries:
+            return [e.path for e in entries if e.name.endswith(suffix) and e.is_file(follow_symlinks=False)]
+    except FileNotFoundError:
+        log_error(f"Folder not found: {folder_path}")
+        return []
     except Exception as e:
         log_error(f"Error listing files: {str(e)}")
         return []
@@ -50,28 +49,35 @@ def move_file(source_path: str, destination_path: str, create_dirs: bool = True)
         Dict with success status
     """
     try:
-        source = Path(source_path)
-        destination = Path(destination_path)
-        
-        if not source.exists():
-            log_error(f"Source file not found: {source_path}")
-            return {"success": False, "error": "Source file not found"}
+        destination_dir = os.path.dirname(destination_path)
             
         # Create destination directory if it doesn't exist
-        if create_dirs:
-            os.makedirs(destination.parent, exist_ok=True)
+        if create_dirs and destination_dir:
+            os.makedirs(destination_dir, exist_ok=True)
             
-        # Move the file
-        shutil.move(source, destination)
+        # Move the file: a single atomic rename on the same filesystem,
+        # shutil.move (copy + delete) across filesystems or onto a directory
+        try:
+            os.replace(source_path, destination_path)
+        except FileNotFoundError:
+            if not os.path.exists(source_path):
+                log_error(f"Source file not found: {source_path}")
+                return {"success": False, "error": "Source file not found"}
+            raise
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.EISDIR, errno.ENOTEMPTY, errno.EEXIST):
+                raise
+            shutil.move(source_path, destination_path)
         
-        log_debug(f"Moved file: {source.name} -> {destination.name}")
-        return {"success": True, "source": str(source), "destination": str(destination)}
+        log_debug("Moved file: %s -> %s", os.path.basename(source_path), os.path.basename(destination_path))
+        return {"success": True, "source": source_path, "destination": destination_path}
     except Exception as e:
         log_error(f"Error moving file: {str(e)}")
         return {"success": False, "error": str(e)}
 
 @tool
-def copy_file(source_path: str, destination_path: str, create_dirs: bool = True) -> Dict[str, Any]:
+def copy_file(source_path: str, destination_path: str, create_dirs: bool = True,
+              preserve_metadata: bool = False) -> Dict[str, Any]:
     """
     Copy a file from source to destination.
     
@@ -79,27 +85,37 @@ def copy_file(source_path: str, destination_path: str, create_dirs: bool = True)
         source_path: Path to source file
         destination_path: Path to destination
         create_dirs: Whether to create destination directories if they don't exist
+        preserve_metadata: Whether to also copy permissions and timestamps (default: False)
         
     Returns:
         Dict with success status
     """
     try:
-        source = Path(source_path)
-        destination = Path(destination_path)
-        
-        if not source.exists():
-            log_error(f"Source file not found: {source_path}")
-            return {"success": False, "error": "Source file not found"}
+        destination_dir = os.path.dirname(destination_path)
             
         # Create destination directory if it doesn't exist
-        if create_dirs:
-            os.makedirs(destination.parent, exist_ok=True)
+        if create_dirs and destination_dir:
+            os.makedirs(destination_dir, exist_ok=True)
             
-        # Copy the file
-        shutil.copy2(source, destination)
+        # Copy the file; copyfile skips copystat's extra syscalls and uses the
+        # kernel's in-place copy (copy_file_range/sendfile) where available.
+        # A missing source surfaces as FileNotFoundError rather than a separate stat.
+        destination = destination_path
+        try:
+            if preserve_metadata:
+                destination = shutil.copy2(source_path, destination_path)
+            else:
+                if os.path.isdir(destination_path):
+                    destination = os.path.join(destination_path, os.path.basename(source_path))
+                shutil.copyfile(source_path, destination)
+        except FileNotFoundError:
+            if not os.path.exists(source_path):
+                log_error(f"Source file not found: {source_path}")
+                return {"success": False, "error": "Source file not found"}
+            raise
         
-        log_debug(f"Copied file: {source.name} -> {destination.name}")
-        return {"success": True, "source": str(source), "destination": str(destination)}
+        log_debug("Copied file: %s -> %s", os.path.basename(source_path), os.path.basename(destination))
+        return {"success": True, "source": source_path, "destination": destination}
     except Exception as e:
         log_error(f"Error copying file: {str(e)}")
         return {"success": False, "error": str(e)}
@@ -117,18 +133,17 @@ def rename_file(file_path: str, new_name: str) -> Dict[str, Any]:
         Dict with success status
     """
     try:
-        path = Path(file_path)
-        if not path.exists():
+        new_path = os.path.join(os.path.dirname(file_path), new_name)
+        
+        # Rename the file (a missing file raises instead of being stat'ed first)
+        try:
+            os.rename(file_path, new_path)
+        except FileNotFoundError:
             log_error(f"File not found: {file_path}")
             return {"success": False, "error": "File not found"}
-            
-        new_path = path.parent / new_name
-        
-        # Rename the file
-        path.rename(new_path)
         
-        log_debug(f"Renamed file: {path.name} -> {new_name}")
-        return {"success": True, "original": str(path), "new": str(new_path)}
+        log_debug("Renamed file: %s -> %s", os.path.basename(file_path), new_name)
+        return {"success": True, "original": file_path, "new": new_path}
     except Exception as e:
         log_error(f"Error renaming file: {str(e)}")
         return {"success": False, "error": str(e)}
@@ -145,11 +160,10 @@ def create_directory(dir_path: str) -> Dict[str, Any]:
         Dict with success status
     """
     try:
-        path = Path(dir_path)
-        os.makedirs(path, exist_ok=True)
+        os.makedirs(dir_path, exist_ok=True)
         
-        log_debug(f"Created directory: {dir_path}")
-        return {"success": True, "path": str(path)}
+        log_debug("Created directory: %s", dir_path)
+        return {"success": True, "path": os.path.normpath(dir_path)}
     except Exception as e:
         log_error(f"Error creating directory: {str(e)}")
         return {"success": False, "error": str(e)}
\ No newline at end of file
@@ -5,11 +5,115 @@ This module provides utility functions for parsing job descriptions.
 """
 
 import re
-import json
-from typing import List
+from typing import Dict, List, Optional, Set
 
 from agno.tools import tool
 from logger.logger import log_debug, log_error
+from tools.tool_utils import dumps
+
+try:
+    import ahocorasick
+    _AHOCORASICK_AVAILABLE = True
+except ImportError:
+    _AHOCORASICK_AVAILABLE = False
+
+# Patterns are compiled once at import and reused across every JD parse
+_TITLE_PATTERNS = [
+    re.compile(r"(?:Job Title|Position|Role):\s*([^\n]+)", re.IGNORECASE),
+    re.compile(r"^([^:]+?)(?:Job|Position|Role|Overview)", re.IGNORECASE),
+    re.compile(r"([^:]+?)\s+\d+[\+]?\s+[Yy]ears", re.IGNORECASE),
+]
+
+# Matches "<years> years of <skill>", so groups come back as (years, skill)
+_YEARS_FIRST_SKILL_PATTERN = re.compile(
+    r"(\d+)(?:\+)?\s*(?:years|yrs)(?:\s*of)?\s*(\w+(?:\s+\w+)?)", re.IGNORECASE
+)
+_SKILL_PATTERNS = [
+    re.compile(r"(\w+(?:\s+\w+)?):\s*(\d+)(?:\+)?\s*(?:years|yrs)", re.IGNORECASE),
+    re.compile(r"(\w+(?:\s+\w+)?)\s*\((\d+)(?:\+)?\s*(?:years|yrs)?\)", re.IGNORECASE),
+    re.compile(r"(\w+(?:\s+\w+)?)\s*(?:with)?\s*(\d+)(?:\+)?\s*(?:years|yrs)", re.IGNORECASE),
+    _YEARS_FIRST_SKILL_PATTERN,
+]
+
+COMMON_SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "PHP", "Ruby", "Go",
+    "SQL", "NoSQL", "MongoDB", "PostgreSQL", "MySQL", "Redis", "AWS", "Azure", "GCP",
+    "Docker", "Kubernetes", "ML", "AI", "Machine Learning", "Deep Learning", "NLP",
+    "React", "Angular", "Vue", "Node.js", "Django", "Flask", "FastAPI", "Spring",
+    "DevOps", "CI/CD", "Git", "Jenkins", "Terraform", "Ansible", "Agile", "Scrum"
+]
+# One alternation scans the text once for every common skill (longest first so
+# "JavaScript" wins over "Java"); matches map back to the canonical spelling
+_COMMON_SKILLS_RE = re.compile(
+    r'\b(?:' + '|'.join(map(re.escape, sorted(COMMON_SKILLS, key=len, reverse=True))) + r')\b',
+    re.IGNORECASE
+)
+_COMMON_SKILL_BY_LOWER = {skill.lower(): skill for skill in COMMON_SKILLS}
+
+# With pyahocorasick installed, all common skills are found in a single automaton pass
+if _AHOCORASICK_AVAILABLE:
+    _COMMON_SKILL_AUTOMATON = ahocorasick.Automaton()
+    for _skill in COMMON_SKILLS:
+        _COMMON_SKILL_AUTOMATON.add_word(_skill.lower(), _skill)
+    _COMMON_SKILL_AUTOMATON.make_automaton()
+
+
+def _is_word_char(text: str, i: int) -> bool:
+    """Whether text[i] is a regex word character (out of range counts as non-word)."""
+    return 0 <= i < len(text) and (text[i].isalnum() or text[i] == '_')
+
+
+def _find_common_skills(text: str) -> Set[str]:
+    """Find the common skills mentioned in text, with \\b word-boundary semantics."""
+    if not _AHOCORASICK_AVAILABLE:
+        return {_COMMON_SKILL_BY_LOWER[m.lower()] for m in _COMMON_SKILLS_RE.findall(text)}
+
+    lowered = text.lower()
+    found = set()
+    for end, skill in _COMMON_SKILL_AUTOMATON.iter(lowered):
+        start = end - len(skill) + 1
+        if (_is_word_char(lowered, start - 1) != _is_word_char(lowered, start)
+                and _is_word_char(lowered, end) != _is_word_char(lowered, end + 1)):
+            found.add(skill)
+    return found
+
+# Section headers, found in one pass over the text for each section extractor. A section
+# runs from the first start header through the next end header (inclusive), or to
+# the end of the text (before a trailing newline), like the regex
+# '(?:<start>).*?(?:<end>|$)' with re.DOTALL. No header overlaps another, so
+# finditer sees every occurrence.
+_RESP_START = ("Responsibilities", "RESPONSIBILITIES", "Duties", "DUTIES", "You will")
+_QUAL_START = ("Requirements", "REQUIREMENTS", "Qualifications", "QUALIFICATIONS")
+_QUAL_END = ("Benefits", "BENEFITS")
+_SECTION_HEADER_RE = re.compile('|'.join(map(re.escape, _RESP_START + _QUAL_START + _QUAL_END)))
+
+
+def _section_index(text: str) -> Dict[str, str]:
+    """Locate the responsibilities and qualifications sections with one header scan."""
+    headers = [(m.start(), m.end(), m.group(0)) for m in _SECTION_HEADER_RE.finditer(text)]
+    text_end = len(text) - 1 if text.endswith('\n') else len(text)
+
+    def _section(start_names, end_names) -> Optional[str]:
+        for i, (start, start_end, name) in enumerate(headers):
+            if name in start_names:
+                for begin, end, other in headers[i + 1:]:
+                    if other in end_names and begin >= start_end:
+                        return text[start:end]
+                return text[start:text_end]
+        return None
+
+    sections = {}
+    responsibilities = _section(_RESP_START, _QUAL_START)
+    if responsibilities is not None:
+        sections["responsibilities"] = responsibilities
+    qualifications = _section(_QUAL_START, _QUAL_END)
+    if qualifications is not None:
+        sections["qualifications"] = qualifications
+    return sections
+
+_BULLET_RE = re.compile(r'(?:•|\*|\-|\d+\.)\s*([^\n•\*\-\d\.][^\n]+)')
+_RESP_HEADER_RE = re.compile(r'responsibilities|duties', re.IGNORECASE)
+_QUAL_HEADER_RE = re.compile(r'requirements|qualifications', re.IGNORECASE)
 
 
 @tool
@@ -23,25 +127,25 @@ def extract_job_title(text: str) -> str:
     Returns:
         Extracted job title as JSON string
     """
+    return dumps(extract_job_title_obj(text))
+
+
+def extract_job_title_obj(text: str) -> str:
+    """Extract job title."""
     try:
-        title_patterns = [
-            r"(?:Job Title|Position|Role):\s*([^\n]+)",
-            r"^([^:]+?)(?:Job|Position|Role|Overview)",
-            r"([^:]+?)\s+\d+[\+]?\s+[Yy]ears"
-        ]
-        for pattern in title_patterns:
-            title_match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _TITLE_PATTERNS:
+            title_match = pattern.search(text)
             if title_match:
-                return json.dumps(title_match.group(1).strip())
+                return title_match.group(1).strip()
 
         first_line = text.strip().split('\n')[0]
         if len(first_line) < 100:
-            return json.dumps(first_line)
+            return first_line
 
-        return json.dumps("Undefined Role")
+        return "Undefined Role"
     except Exception as e:
         log_error(f"Error in extract_job_title: {e}")
-        return json.dumps("Undefined Role")
+        return "Undefined Role"
 
 
 @tool
@@ -55,21 +159,19 @@ def extract_required_skills(text: str) -> str:
     Returns:
         JSON string of Dict mapping skills to required years
     """
-    try:
-        patterns = [
-            r"(\w+(?:\s+\w+)?):\s*(\d+)(?:\+)?\s*(?:years|yrs)",
-            r"(\w+(?:\s+\w+)?)\s*\((\d+)(?:\+)?\s*(?:years|yrs)?\)",
-            r"(\w+(?:\s+\w+)?)\s*(?:with)?\s*(\d+)(?:\+)?\s*(?:years|yrs)",
-            r"(\d+)(?:\+)?\s*(?:years|yrs)(?:\s*of)?\s*(\w+(?:\s+\w+)?)",
-        ]
+    return dumps(extract_required_skills_obj(text))
 
+
+def extract_required_skills_obj(text: str) -> Dict[str, int]:
+    """Extract required skills."""
+    try:
         skills = {}
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in _SKILL_PATTERNS:
+            matches = pattern.findall(text)
             for match in matches:
                 if len(match) == 2:
                     skill, years = match
-                    if pattern == patterns[-1]:
+                    if pattern is _YEARS_FIRST_SKILL_PATTERN:
                         skill, years = years, skill
                     try:
                         skills[skill.strip()] = int(years.strip())
@@ -77,21 +179,15 @@ def extract_required_skills(text: str) -> str:
                         skills[skill.strip()] = 1
 
         if not skills:
-            common_skills = [
-                "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "PHP", "Ruby", "Go",
-                "SQL", "NoSQL", "MongoDB", "PostgreSQL", "MySQL", "Redis", "AWS", "Azure", "GCP",
-                "Docker", "Kubernetes", "ML", "AI", "Machine Learning", "Deep Learning", "NLP",
-                "React", "Angular", "Vue", "Node.js", "Django", "Flask", "FastAPI", "Spring",
-                "DevOps", "CI/CD", "Git", "Jenkins", "Terraform", "Ansible", "Agile", "Scrum"
-            ]
-            for skill in common_skills:
-                if re.search(r'\b' + re.escape(skill) + r'\b', text, re.IGNORECASE):
+            found = _find_common_skills(text)
+            for skill in COMMON_SKILLS:
+                if skill in found:
                     skills[skill] = 1
 
-        return json.dumps(skills)
+        return skills
     except Exception as e:
         log_error(f"Error in extract_required_skills: {e}")
-        return json.dumps({})
+        return {}
 
 
 @tool
@@ -105,28 +201,30 @@ def extract_responsibilities(text: str) -> str:
     Returns:
         JSON string of list of responsibilities
     """
+    return dumps(extract_responsibilities_obj(text))
+
+
+def extract_responsibilities_obj(text: str) -> List[str]:
+    """Extract responsibilities."""
     try:
         responsibilities = []
-        resp_section = re.search(
-            r'(?:Responsibilities|RESPONSIBILITIES|Duties|DUTIES|You will).*?(?:Requirements|REQUIREMENTS|Qualifications|QUALIFICATIONS|$)', 
-            text, re.DOTALL)
+        section_text = _section_index(text).get("responsibilities")
 
-        if resp_section:
-            section_text = resp_section.group(0)
-            bullets = re.findall(r'(?:•|\*|\-|\d+\.)\s*([^\n•\*\-\d\.][^\n]+)', section_text)
+        if section_text is not None:
+            bullets = _BULLET_RE.findall(section_text)
             if bullets:
                 responsibilities.extend([bullet.strip() for bullet in bullets])
             else:
                 lines = [line.strip() for line in section_text.split('\n') if line.strip()]
-                if len(lines) > 1 and re.search(r'responsibilities|duties', lines[0], re.IGNORECASE):
+                if len(lines) > 1 and _RESP_HEADER_RE.search(lines[0]):
                     responsibilities.extend(lines[1:])
                 else:
                     responsibilities.extend(lines)
 
-        return json.dumps(responsibilities)
+        return responsibilities
     except Exception as e:
         log_error(f"Error in extract_responsibilities: {e}")
-        return json.dumps([])
+        return []
 
 
 @tool
@@ -140,25 +238,27 @@ def extract_qualifications(text: str) -> str:
     Returns:
         JSON string of list of qualifications
     """
+    return dumps(extract_qualifications_obj(text))
+
+
+def extract_qualifications_obj(text: str) -> List[str]:
+    """Extract qualifications."""
     try:
         qualifications = []
-        qual_section = re.search(
-            r'(?:Requirements|REQUIREMENTS|Qualifications|QUALIFICATIONS).*?(?:Benefits|BENEFITS|$)', 
-            text, re.DOTALL)
+        section_text = _section_index(text).get("qualifications")
 
-        if qual_section:
-            section_text = qual_section.group(0)
-            bullets = re.findall(r'(?:•|\*|\-|\d+\.)\s*([^\n•\*\-\d\.][^\n]+)', section_text)
+        if section_text is not None:
+            bullets = _BULLET_RE.findall(section_text)
             if bullets:
                 qualifications.extend([bullet.strip() for bullet in bullets])
             else:
                 lines = [line.strip() for line in section_text.split('\n') if line.strip()]
-                if len(lines) > 1 and re.search(r'requirements|qualifications', lines[0], re.IGNORECASE):
+                if len(lines) > 1 and _QUAL_HEADER_RE.search(lines[0]):
                     qualifications.extend(lines[1:])
                 else:
                     qualifications.extend(lines)
 
-        return json.dumps(qualifications)
+        return qualifications
     except Exception as e:
         log_error(f"Error in extract_qualifications: {e}")
-        return json.dumps([])
+        return []
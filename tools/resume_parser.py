@@ -1,65 +1,137 @@
 from agno.tools import tool
 from pathlib import Path
-import json
+import functools
+import hashlib
+import mmap
+import os
+from config.settings import get_settings
 from logger.logger import log_info, log_debug, log_error, log_warn
-from typing import Dict
+from tools.tool_utils import dumps, loads, process_map
+from typing import Any, Dict, FrozenSet, Union
 
-def safe_read_pdf(path: Path) -> str:
-    """Safely read the content of a PDF file using fallback encodings."""
+try:
+    import diskcache
+    _DISKCACHE_AVAILABLE = True
+except ImportError:
+    _DISKCACHE_AVAILABLE = False
+
+try:
+    import fitz
+    _FITZ_AVAILABLE = True
+except ImportError:
+    _FITZ_AVAILABLE = False
+
+@functools.lru_cache(maxsize=1)
+def _get_pdf_text_cache():
+    """Get the on-disk PDF text cache (one per process), or None if diskcache is unavailable."""
+    if not _DISKCACHE_AVAILABLE:
+        return None
+    return diskcache.Cache(str(get_settings().CACHE_DIR / "pdf_text"))
+
+def _content_key(path: str, size: int) -> str:
+    """Hash a file's bytes straight from a read-only mapping (no Python-owned copy)."""
+    if size == 0:
+        return hashlib.sha1(b"", usedforsecurity=False).hexdigest()
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        return hashlib.sha1(mm, usedforsecurity=False).hexdigest()
+
+def safe_read_pdf(path: Union[str, Path]) -> str:
+    """Safely read the content of a PDF file with PyMuPDF, or as text using a fallback encoding."""
+    st = os.stat(path)
+    return _read_pdf(str(path), st.st_mtime_ns, st.st_size)
+
+@functools.lru_cache(maxsize=256)
+def _read_pdf(path_str: str, mtime_ns: int, size: int) -> str:
+    """Read a file's text (memoized per path and stat signature, so edits invalidate it)."""
+    if _FITZ_AVAILABLE and path_str.lower().endswith('.pdf'):
+        # Serve unchanged PDFs from the on-disk text cache, keyed by content hash
+        cache = _get_pdf_text_cache()
+        key = _content_key(path_str, size) if cache is not None else None
+        if key is not None:
+            content = cache.get(key)
+            if content is not None:
+                return content
+
+        # MuPDF reads the file itself, so the PDF bytes never become a Python object
+        with fitz.open(path_str, filetype="pdf") as doc:
+            content = "".join(page.get_text("text") for page in doc)
+        if key is not None:
+            cache.set(key, content)
+        return content
+
+    # Without PyMuPDF (or for non-PDF files), read once and decode in memory:
+    # strict UTF-8 first, else latin-1 (which maps every byte, so it cannot fail)
+    with open(path_str, 'rb') as f:
+        data = f.read()
     try:
-        return path.read_text(encoding='utf-8')
+        return data.decode('utf-8')
     except UnicodeDecodeError:
-        for encoding in ['latin-1', 'cp1252', 'iso-8859-1']:
-            try:
-                return path.read_text(encoding=encoding)
-            except UnicodeDecodeError:
-                continue
-        return path.read_bytes().decode('utf-8', errors='replace')
+        return data.decode('latin-1')
 
 def success_response(data: Dict) -> str:
     data["success"] = True
-    return json.dumps(data)
+    return dumps(data)
 
 def error_response(message: str, extra: Dict = {}) -> str:
-    return json.dumps({"success": False, "error": message, **extra})
+    return dumps({"success": False, "error": message, **extra})
 
 @tool(description="Parse a resume PDF and extract its text content.")
 def parse_resume_pdf(pdf_path: str) -> str:
-    path = Path(pdf_path)
-    if not path.exists():
+    if not os.path.exists(pdf_path):
         log_error(f"[parse_resume_pdf] File not found: {pdf_path}")
         return error_response(f"File not found: {pdf_path}")
 
     try:
-        content = safe_read_pdf(path)
-        log_debug(f"[parse_resume_pdf] Extracted {len(content)} characters from {path.name}")
-        return success_response({"filename": path.name, "content": content})
+        filename = os.path.basename(pdf_path)
+        content = safe_read_pdf(pdf_path)
+        log_debug("[parse_resume_pdf] Extracted %s characters from %s", len(content), filename)
+        return success_response({"filename": filename, "content": content})
     except Exception as e:
         log_error(f"[parse_resume_pdf] Error: {str(e)}")
         return error_response(str(e))
 
+@functools.lru_cache(maxsize=1024)
+def _read_metadata(path_str: str, mtime_ns: int, size: int) -> Any:
+    """Parse a metadata JSON file (memoized per path and stat signature; shared result, do not mutate)."""
+    with open(path_str, 'rb') as f:
+        return loads(f.read())
+
 @tool(description="Load metadata from a JSON file for a given resume.")
 def load_metadata(metadata_path: str) -> str:
-    path = Path(metadata_path)
-    if not path.exists():
+    try:
+        st = os.stat(metadata_path)
+    except FileNotFoundError:
         log_warn(f"[load_metadata] Metadata file not found: {metadata_path}")
         return error_response(f"File not found: {metadata_path}", {"metadata": {}, "warning": f"Missing metadata"})
 
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            metadata = json.load(f)
-        log_info(f"[load_metadata] Metadata loaded for {path.stem}", source="resume_agent")
+        metadata = _read_metadata(metadata_path, st.st_mtime_ns, st.st_size)
+        stem = os.path.splitext(os.path.basename(metadata_path))[0]
+        log_info(f"[load_metadata] Metadata loaded for {stem}", source="resume_agent")
         return success_response({"metadata": metadata})
     except Exception as e:
         log_error(f"[load_metadata] Error: {str(e)}")
         return error_response(str(e))
 
+@functools.lru_cache(maxsize=32)
+def _list_metadata(folder: str, mtime_ns: int) -> FrozenSet[str]:
+    """List metadata file stems in a folder (cached until the folder's mtime changes)."""
+    with os.scandir(folder) as entries:
+        return frozenset(e.name[:-5] for e in entries if e.name.endswith(".json") and e.is_file())
+
 @tool(description="Find metadata file matching a given resume.")
 def find_matching_metadata(resume_name: str, metadata_folder: str) -> str:
     try:
-        metadata_path = Path(metadata_folder) / f"{resume_name}.json"
-        if metadata_path.exists():
-            return success_response({"metadata_path": str(metadata_path)})
+        try:
+            names = _list_metadata(metadata_folder, os.stat(metadata_folder).st_mtime_ns)
+        except FileNotFoundError:
+            names = frozenset()
+
+        if resume_name in names:
+            metadata_path = os.path.join(metadata_folder, f"{resume_name}.json")
+            return success_response({"metadata_path": metadata_path})
         else:
             log_warn(f"[find_matching_metadata] No match for {resume_name}")
             return error_response(f"No metadata for {resume_name}", {"warning": "Missing metadata"})
@@ -67,37 +139,41 @@ def find_matching_metadata(resume_name: str, metadata_folder: str) -> str:
         log_error(f"[find_matching_metadata] Error: {str(e)}")
         return error_response(str(e))
 
+def _extract_one(pdf_path: str) -> Dict[str, Any]:
+    """Extract one resume's text for batch processing (runs in a worker process)."""
+    filename = os.path.basename(pdf_path)
+    try:
+        return {
+            "filename": filename,
+            "path": pdf_path,
+            "content": safe_read_pdf(pdf_path),
+            "success": True
+        }
+    except Exception as e:
+        log_error(f"[batch_process_resume_folder] Error processing {filename}: {str(e)}")
+        return {
+            "filename": filename,
+            "path": pdf_path,
+            "success": False,
+            "error": str(e)
+        }
+
 @tool(description="Process all resume files in a folder.")
 def batch_process_resume_folder(folder_path: str) -> str:
-    folder = Path(folder_path)
-    if not folder.exists():
+    if not os.path.exists(folder_path):
         log_error(f"[batch_process_resume_folder] Folder not found: {folder_path}")
         return error_response(f"Folder not found: {folder_path}")
 
     try:
-        pdf_files = list(folder.glob("*.pdf"))
-        log_info(f"[batch_process_resume_folder] Found {len(pdf_files)} files")
-        results = []
-
-        for pdf_file in pdf_files:
-            try:
-                content = safe_read_pdf(pdf_file)
-                results.append({
-                    "filename": pdf_file.name,
-                    "path": str(pdf_file),
-                    "content": content,
-                    "success": True
-                })
-            except Exception as e:
-                results.append({
-                    "filename": pdf_file.name,
-                    "path": str(pdf_file),
-                    "success": False,
-                    "error": str(e)
-                })
+        with os.scandir(folder_path) as entries:
+            paths = [e.path for e in entries if e.name.endswith(".pdf") and e.is_file(follow_symlinks=False)]
+        log_info(f"[batch_process_resume_folder] Found {len(paths)} files")
+
+        # Extract in parallel across processes
+        results = process_map(_extract_one, paths)
 
         return success_response({
-            "total_files": len(pdf_files),
+            "total_files": len(paths),
             "processed_files": len(results),
             "results": results
         })
@@ -0,0 +1,117 @@
+"""
+Skill Matching Kernel
+
+This module counts occurrences of job skills in resume text. The inner loop is
+JIT-compiled with Numba when it is installed and falls back to pure Python otherwise.
+"""
+
+import re
+import zlib
+from typing import Dict, Iterable, List, Tuple
+
+try:
+    import numpy as np
+    from numba import njit, prange
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+(?:[./][a-z0-9+#]+)*")
+
+
+def _tokenize(text: str) -> List[str]:
+    """Lowercase and split text into skill-comparable tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _token_id(token: str) -> int:
+    """Stable non-negative int32 id for a token."""
+    return zlib.crc32(token.encode('utf-8')) & 0x7FFFFFFF
+
+
+def _skills_to_int(skills: Iterable[str]) -> Tuple[List[int], List[int]]:
+    """
+    Encode skills as a flat list of token ids plus offsets.
+
+    Args:
+        skills: Skill names (multi-word skills become token sequences)
+
+    Returns:
+        (flat token ids, offsets) where skill i spans ids[offsets[i]:offsets[i + 1]]
+    """
+    ids: List[int] = []
+    offsets = [0]
+    for skill in skills:
+        ids.extend(_token_id(token) for token in _tokenize(skill))
+        offsets.append(len(ids))
+    return ids, offsets
+
+
+def _match_counts_py(resume_ids: List[int], skill_ids: List[int], offsets: List[int]) -> List[int]:
+    """Pure Python fallback for counting skill token-sequence hits."""
+    counts = [0] * (len(offsets) - 1)
+    n_tokens = len(resume_ids)
+    for i in range(len(counts)):
+        seq = skill_ids[offsets[i]:offsets[i + 1]]
+        width = len(seq)
+        if width == 0:
+            continue
+        for j in range(n_tokens - width + 1):
+            if resume_ids[j:j + width] == seq:
+                counts[i] += 1
+    return counts
+
+
+if _NUMBA_AVAILABLE:
+    @njit(cache=True, parallel=True)
+    def _match_counts(resume_ids, skill_ids, offsets):
+        """Count skill token-sequence hits; one skill per parallel iteration."""
+        n_skills = offsets.shape[0] - 1
+        n_tokens = resume_ids.shape[0]
+        counts = np.zeros(n_skills, dtype=np.int32)
+        for i in prange(n_skills):
+            start = offsets[i]
+            width = offsets[i + 1] - start
+            if width == 0:
+                continue
+            hits = 0
+            for j in range(n_tokens - width + 1):
+                matched = True
+                for k in range(width):
+                    if resume_ids[j + k] != skill_ids[start + k]:
+                        matched = False
+                        break
+                if matched:
+                    hits += 1
+            counts[i] = hits
+        return counts
+
+
+def match_skills(resume_content: str, skills: Iterable[str]) -> Dict[str, int]:
+    """
+    Count how often each skill appears in the resume text.
+
+    Args:
+        resume_content: The content of the resume
+        skills: Skill names to look for
+
+    Returns:
+        Dict mapping each skill to its number of occurrences
+    """
+    skills = list(skills)
+    if not skills:
+        return {}
+
+    resume_ids = [_token_id(token) for token in _tokenize(resume_content)]
+    skill_ids, offsets = _skills_to_int(skills)
+
+    if _NUMBA_AVAILABLE:
+        counts = _match_counts(
+            np.fromiter(resume_ids, dtype=np.int32, count=len(resume_ids)),
+            np.asarray(skill_ids, dtype=np.int32),
+            np.asarray(offsets, dtype=np.int64),
+        ).tolist()
+    else:
+        counts = _match_counts_py(resume_ids, skill_ids, offsets)
+
+    return dict(zip(skills, counts))
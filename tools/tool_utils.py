@@ -4,7 +4,21 @@ Tool Utilities
 This module provides utility functions and type definitions for tools.
 """
 
-from typing import TypedDict, Dict, List, Any, Optional, Union, Literal
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import TypedDict, Callable, Dict, List, Any, Optional, Tuple, TypeVar, Union, Literal
+
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
+_FADVISE_AVAILABLE = hasattr(os, "posix_fadvise")
+
+_T = TypeVar("_T")
 
 # Success response type
 class SuccessResponse(TypedDict):
@@ -23,14 +37,82 @@ ToolResponse = Union[SuccessResponse, ErrorResponse]
 # Helper function to create success response
 def success_response(**kwargs) -> SuccessResponse:
     """Create a standardized success response."""
-    response: Dict[str, Any] = {"success": True}
-    response.update(kwargs)
-    return response
+    return {"success": True, **kwargs}
 
 # Helper function to create error response
 def error_response(error_message: str, traceback: Optional[str] = None) -> ErrorResponse:
     """Create a standardized error response."""
-    response: Dict[str, Any] = {"success": False, "error": error_message}
-    if traceback:
-        response["traceback"] = traceback
-    return response
\ No newline at end of file
+    if not traceback:
+        return {"success": False, "error": error_message}
+    return {"success": False, "error": error_message, "traceback": traceback}
+
+# Helper function to serialize tool payloads
+def dumps(obj: Any) -> str:
+    """Serialize an object to a JSON string, using orjson when available."""
+    if _ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj)
+
+# Helper function to parse tool payloads
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON string, using orjson when available."""
+    if _ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Helper function to warm the page cache ahead of a read
+def prefetch_file(path: str) -> None:
+    """Ask the kernel to start reading a file in the background (no-op where unsupported)."""
+    if not _FADVISE_AVAILABLE:
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+# Helper function to size a process pool for a batch of files
+def pool_size(n_items: int) -> Tuple[int, int]:
+    """Size a process pool for a batch, as (workers, chunksize)."""
+    # No more workers than items, and chunks small enough to spread a small batch over all of them
+    workers = max(1, min(n_items, os.cpu_count() or 1))
+    chunksize = max(1, min(4, n_items // workers))
+    return workers, chunksize
+
+# Helper function to map a function over files in a process pool
+def process_map(fn: Callable[[str], _T], paths: List[str]) -> List[_T]:
+    """
+    Apply fn to each file path in parallel worker processes, keeping input order.
+
+    Args:
+        fn: Picklable (module-level) function taking one file path
+        paths: File paths to process
+
+    Returns:
+        fn's result for each path, in the order of paths
+    """
+    # A single file is not worth the pool startup
+    if len(paths) <= 1:
+        return [fn(path) for path in paths]
+
+    workers, chunksize = pool_size(len(paths))
+    # Keep a read-ahead window in front of the workers: on a cold cache the
+    # next files are already being fetched while the current ones are parsed
+    window = workers * chunksize * 2
+    for path in paths[:window]:
+        prefetch_file(path)
+
+    # Spawn rather than fork: the parent runs background threads (knowledge base
+    # loader, Mongo writer, HTTP pools) whose locks a forked child could inherit held
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as ex:
+        for i, result in enumerate(ex.map(fn, paths, chunksize=chunksize)):
+            results.append(result)
+            if i + window < len(paths):
+                prefetch_file(paths[i + window])
+    return results